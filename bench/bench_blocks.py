@@ -0,0 +1,112 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import block_markdown
+from block_markdown import (
+    BlockType,
+    block_to_block_type,
+    code_to_html,
+    get_code_contents,
+    get_heading_contents,
+    get_heading_level,
+    get_ordered_items,
+    get_quote_contents,
+    get_unordered_items,
+    heading_to_html,
+    markdown_to_blocks,
+    markdown_to_html_node,
+    ordered_to_html,
+    paragraph_to_html,
+    quote_to_html,
+    unordered_to_html,
+)
+
+SAMPLE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "content", "majesty", "index.md"
+)
+
+
+# The validating entry points the renderer used to chain together; each of
+# them classifies the block again before doing its part of the work.
+VALIDATING_CALLS = {
+    BlockType.paragraph: [paragraph_to_html],
+    BlockType.heading: [heading_to_html, get_heading_contents, get_heading_level],
+    BlockType.code: [code_to_html, get_code_contents],
+    BlockType.unordered_list: [unordered_to_html, get_unordered_items],
+    BlockType.ordered_list: [ordered_to_html, get_ordered_items],
+    BlockType.quote: [quote_to_html],
+}
+
+
+def validating_render(markdown):
+    for block in markdown_to_blocks(markdown):
+        block_type = block_to_block_type(block)
+        for call in VALIDATING_CALLS[block_type]:
+            call(block)
+        if block_type == BlockType.quote:
+            for line in block.split("\n"):
+                get_quote_contents(line)
+
+
+def count_classifications(render, markdown):
+    calls = 0
+    classify_block = block_markdown.classify_block
+
+    def counting_classify_block(block, lines):
+        nonlocal calls
+        calls += 1
+        return classify_block(block, lines)
+
+    block_markdown.classify_block = counting_classify_block
+    try:
+        render(markdown)
+    finally:
+        block_markdown.classify_block = classify_block
+
+    return calls
+
+
+def time_render(markdown, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        markdown_to_html_node(markdown)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(SAMPLE_PATH, "r") as f:
+        markdown = "\n\n".join([f.read()] * args.scale)
+
+    blocks = len(markdown_to_blocks(markdown))
+    baseline_calls = count_classifications(validating_render, markdown)
+    calls = count_classifications(markdown_to_html_node, markdown)
+    elapsed = time_render(markdown, args.repeat)
+
+    print(f"Document: {len(markdown) / 1e6:.2f} MB, {blocks} blocks")
+    print(
+        f"Classifications, validating entry points: {baseline_calls} "
+        f"({baseline_calls / blocks:.2f} per block)"
+    )
+    print(
+        f"Classifications, markdown_to_html_node: {calls} "
+        f"({calls / blocks:.2f} per block)"
+    )
+    print(f"markdown_to_html_node: {elapsed * 1000:.1f} ms (best of {args.repeat})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from assets import sync_dir
+
+LARGE_SAMPLE = os.path.join(
+    os.path.dirname(__file__), "..", "static", "images", "rivendell.png"
+)
+
+
+def build_tree(root, small_files, large_files, small_size):
+    payload = os.urandom(small_size)
+    for i in range(small_files):
+        path = os.path.join(root, f"dir{i % 50}", f"file{i}.txt")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(payload)
+
+    os.makedirs(os.path.join(root, "images"), exist_ok=True)
+    for i in range(large_files):
+        shutil.copy(LARGE_SAMPLE, os.path.join(root, "images", f"large{i}.png"))
+
+
+def tree_size(root):
+    total = 0
+    for dir_path, _, files in os.walk(root):
+        for name in files:
+            total += os.path.getsize(os.path.join(dir_path, name))
+
+    return total
+
+
+def serial_copy(src_dir, dest_dir):
+    if not os.path.exists(dest_dir):
+        os.mkdir(dest_dir)
+
+    for content in os.listdir(src_dir):
+        src_path = os.path.join(src_dir, content)
+        dest_path = os.path.join(dest_dir, content)
+        if os.path.isfile(src_path):
+            shutil.copy(src_path, dest_path)
+        else:
+            serial_copy(src_path, dest_path)
+
+
+def timed(run, dest):
+    shutil.rmtree(dest, ignore_errors=True)
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        run()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--small-files", type=int, default=5000)
+    parser.add_argument("--small-size", type=int, default=4096)
+    parser.add_argument("--large-files", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "static")
+        dest = os.path.join(tmp, "public")
+        build_tree(src, args.small_files, args.large_files, args.small_size)
+        size_mb = tree_size(src) / 1e6
+
+        runs = [
+            ("serial shutil.copy", lambda: serial_copy(src, dest)),
+            ("sync_dir, 1 worker", lambda: sync_dir(src, dest, link=False, workers=1)),
+            (
+                f"sync_dir, {args.workers} workers",
+                lambda: sync_dir(src, dest, link=False, workers=args.workers),
+            ),
+            ("sync_dir, hardlinks", lambda: sync_dir(src, dest)),
+        ]
+
+        files = args.small_files + args.large_files
+        print(f"Tree: {files} files, {size_mb:.1f} MB")
+        for name, run in runs:
+            elapsed = timed(run, dest)
+            print(
+                f"{name:>24}: {elapsed:.3f} s, {files / elapsed:.0f} files/s, "
+                f"{size_mb / elapsed:.0f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
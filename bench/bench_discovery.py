@@ -0,0 +1,110 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from main import discover_pages
+from manifest import Manifest, hash_file
+
+
+def build_tree(root, files, per_dir):
+    for i in range(files):
+        directory = os.path.join(root, f"section{i // per_dir}")
+        os.makedirs(directory, exist_ok=True)
+        # Half of the tree is pages, the rest are assets living beside them.
+        name = f"page{i}.md" if i % 2 == 0 else f"image{i}.png"
+        path = os.path.join(directory, name)
+        with open(path, "w") as f:
+            f.write(f"# Page {i}\n\nSome text for page {i}.\n")
+        os.utime(path, (1, 1))
+
+
+def listdir_pages(dir_path_content, dest_dir_path):
+    pages = []
+
+    for entry in sorted(os.listdir(dir_path_content)):
+        entry_path = os.path.join(dir_path_content, entry)
+        dest_path = os.path.join(dest_dir_path, entry)
+
+        if os.path.isfile(entry_path):
+            if entry[-3:] == ".md":
+                pages.append((entry_path, dest_path[:-3] + ".html"))
+
+        else:
+            pages.extend(listdir_pages(entry_path, dest_path))
+
+    return pages
+
+
+def count_stats(run):
+    stat = os.stat
+    calls = 0
+
+    def counting_stat(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return stat(*args, **kwargs)
+
+    with mock.patch.object(os, "stat", counting_stat):
+        run()
+
+    return calls
+
+
+def timed(run):
+    start = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare listdir and scandir page discovery on a large tree"
+    )
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--per-dir", type=int, default=500)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp()
+    try:
+        content = os.path.join(root, "content")
+        build_tree(content, args.files, args.per_dir)
+
+        old_pages, old_time = timed(lambda: listdir_pages(content, "public"))
+        new_pages, new_time = timed(lambda: discover_pages(content, "public"))
+        assert old_pages == [(source, output) for source, output, _, _ in new_pages]
+
+        old_stats = count_stats(lambda: listdir_pages(content, "public"))
+        print(f"{args.files} files, {len(new_pages)} pages")
+        print(f"listdir + isfile: {old_time:.2f} s, {old_stats} os.stat calls")
+        print(
+            f"scandir:          {new_time:.2f} s, {len(new_pages)} stats "
+            "(one DirEntry.stat per page)"
+        )
+
+        manifest = Manifest(os.path.join(root, "manifest.json"))
+        for source, output, size, mtime_ns in new_pages:
+            manifest.record(source, hash_file(source), "", output, (size, mtime_ns))
+
+        _, hash_time = timed(lambda: [hash_file(source) for source, _ in old_pages])
+        _, cached_time = timed(
+            lambda: [
+                manifest.cached_hash(source, size, mtime_ns)
+                for source, _, size, mtime_ns in discover_pages(content, "public")
+            ]
+        )
+        print(
+            f"Unchanged rebuild scan: hashing every page {old_time + hash_time:.2f} s"
+        )
+        print(f"Unchanged rebuild scan: stat-cached hashes {cached_time:.2f} s")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from block_markdown import BlockType, markdown_to_blocks, parse_block
+import textnode
+from textnode import MARKUP_PATTERN, text_to_textnodes
+
+from bench_pipeline import best_time, size_of
+
+SAMPLE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "content", "majesty", "index.md"
+)
+
+
+def inline_texts(markdown):
+    texts = []
+    for block in markdown_to_blocks(markdown):
+        parsed = parse_block(block)
+        if parsed.block_type != BlockType.code:
+            texts.extend(parsed.items)
+
+    return texts
+
+
+def without_fast_path(texts, repeat):
+    # An empty pattern matches every text, so every call takes the full path.
+    textnode.MARKUP_PATTERN = re.compile("")
+    try:
+        return best_time(lambda: [text_to_textnodes(text) for text in texts], repeat)
+    finally:
+        textnode.MARKUP_PATTERN = MARKUP_PATTERN
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the plain-text fast path of text_to_textnodes"
+    )
+    parser.add_argument("--path", default=SAMPLE_PATH)
+    parser.add_argument("--scale", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.path, "r") as f:
+        texts = inline_texts(f.read()) * args.scale
+
+    plain = sum(1 for text in texts if MARKUP_PATTERN.search(text) is None)
+    size = size_of(texts)
+    full = without_fast_path(texts, args.repeat)
+    fast = best_time(lambda: [text_to_textnodes(text) for text in texts], args.repeat)
+
+    print(f"{len(texts)} inline texts, {plain / len(texts):.0%} without markup")
+    print(f"Without fast path: {size / full / 1e6:.2f} MB/s")
+    print(f"text_to_textnodes: {size / fast / 1e6:.2f} MB/s ({full / fast:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import os
+import sys
+import tracemalloc
+from contextlib import ExitStack
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from unittest import mock
+
+import block_markdown
+import textnode
+from block_markdown import markdown_to_blocks, block_to_html
+from textnode import TextNode, text_to_textnodes
+
+PARAGRAPH = (
+    "Plain words with **bold**, *italic* and `code` spans, "
+    "a [link](https://example.com) and an ![image](/images/a.png) inline."
+)
+
+
+def synthetic_markdown(paragraphs):
+    blocks = ["# Synthetic"]
+    for i in range(paragraphs):
+        if i % 10 == 0:
+            blocks.append("\n".join(f"* item {j} with `code` span" for j in range(20)))
+        else:
+            blocks.append(PARAGRAPH)
+
+    return "\n\n".join(blocks)
+
+
+class DictTextNode:
+    # The node classes as they were before __slots__, for the baseline.
+    type_text = TextNode.type_text
+    type_bold = TextNode.type_bold
+    type_italic = TextNode.type_italic
+    type_code = TextNode.type_code
+    type_link = TextNode.type_link
+    type_image = TextNode.type_image
+
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+class DictHTMLNode:
+    def __init__(self, tag=None, value=None, children=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+
+
+def dict_leaf_node(tag, value, props=None):
+    return DictHTMLNode(tag, value, None, props)
+
+
+def dict_parent_node(tag, children, props=None):
+    return DictHTMLNode(tag, None, children, props)
+
+
+def dict_backed_nodes():
+    patches = [
+        mock.patch.object(textnode, "TextNode", DictTextNode),
+        mock.patch.object(textnode, "LeafNode", dict_leaf_node),
+        mock.patch.object(block_markdown, "LeafNode", dict_leaf_node),
+        mock.patch.object(block_markdown, "ParentNode", dict_parent_node),
+    ]
+    stack = ExitStack()
+    for patch in patches:
+        stack.enter_context(patch)
+    return stack
+
+
+def count_nodes(node):
+    if node.children is None:
+        return 1
+
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return result, after - before
+
+
+def measure_nodes(blocks):
+    text_nodes, text_bytes = measure(
+        lambda: [text_to_textnodes(block) for block in blocks[1:] if block[0] != "*"]
+    )
+    text_count = sum(len(nodes) for nodes in text_nodes)
+    del text_nodes
+
+    html_nodes, html_bytes = measure(lambda: [block_to_html(b) for b in blocks])
+    html_count = sum(count_nodes(node) for node in html_nodes)
+    del html_nodes
+
+    return text_count, text_bytes, html_count, html_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paragraphs", type=int, default=20000)
+    args = parser.parse_args()
+
+    markdown = synthetic_markdown(args.paragraphs)
+    blocks = markdown_to_blocks(markdown)
+
+    with dict_backed_nodes():
+        before = measure_nodes(blocks)
+    after = measure_nodes(blocks)
+
+    for name, (text_count, text_bytes, html_count, html_bytes) in (
+        ("dict-backed", before),
+        ("__slots__", after),
+    ):
+        print(
+            f"{name:>11}: TextNode {text_bytes / text_count:.1f} bytes/node, "
+            f"HTMLNode {html_bytes / html_count:.1f} bytes/node "
+            f"({text_count} text nodes, {html_count} HTML nodes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
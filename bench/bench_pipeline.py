@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from block_markdown import (
+    BlockType,
+    block_to_block_type,
+    markdown_to_blocks,
+    markdown_to_html_node,
+    parse_block,
+)
+from corpus import CORPORA, generate
+from textnode import text_to_textnodes
+
+
+def best_time(run, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
+
+
+def size_of(texts):
+    return sum(len(text.encode()) for text in texts)
+
+
+def bench_corpus(pages, repeat):
+    blocks = [block for page in pages for block in markdown_to_blocks(page)]
+    inline_texts = []
+    for block in blocks:
+        parsed = parse_block(block)
+        if parsed.block_type != BlockType.code:
+            inline_texts.extend(parsed.items)
+    nodes = [markdown_to_html_node(page) for page in pages]
+
+    stages = {
+        "markdown_to_blocks": (
+            size_of(pages),
+            lambda: [markdown_to_blocks(page) for page in pages],
+        ),
+        "block_to_block_type": (
+            size_of(blocks),
+            lambda: [block_to_block_type(block) for block in blocks],
+        ),
+        "text_to_textnodes": (
+            size_of(inline_texts),
+            lambda: [text_to_textnodes(text) for text in inline_texts],
+        ),
+        "markdown_to_html_node": (
+            size_of(pages),
+            lambda: [markdown_to_html_node(page) for page in pages],
+        ),
+        "to_html": (
+            size_of(pages),
+            lambda: [node.to_html() for node in nodes],
+        ),
+    }
+
+    results = {}
+    for stage, (size, run) in stages.items():
+        seconds = best_time(run, repeat)
+        results[stage] = {
+            "bytes": size,
+            "seconds": round(seconds, 6),
+            "mb_per_s": round(size / seconds / 1e6, 3),
+        }
+
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for corpus, stages in results.items():
+        for stage, result in stages.items():
+            before = baseline.get(corpus, {}).get(stage)
+            if before is None:
+                continue
+
+            ratio = result["mb_per_s"] / before["mb_per_s"]
+            marker = ""
+            if ratio < 1 - threshold:
+                marker = "  REGRESSION"
+                regressions.append((corpus, stage))
+            print(
+                f"{corpus:<18} {stage:<22} {before['mb_per_s']:8.2f} -> "
+                f"{result['mb_per_s']:8.2f} MB/s ({ratio:5.2f}x){marker}"
+            )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure markdown pipeline throughput on synthetic corpora"
+    )
+    parser.add_argument(
+        "--corpus",
+        action="append",
+        choices=sorted(CORPORA),
+        help="Corpus to run (repeatable, default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Slowdown fraction reported as a regression by --compare",
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.corpus or sorted(CORPORA):
+        pages = generate(name, args.seed)
+        results[name] = bench_corpus(pages, args.repeat)
+        print(f"{name} ({len(pages)} page(s), {size_of(pages) / 1e6:.2f} MB)")
+        for stage, result in results[name].items():
+            print(f"  {stage:<22} {result['mb_per_s']:8.2f} MB/s")
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Results written to {args.output}")
+
+    if args.compare is not None:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+        if len(compare(results, baseline, args.threshold)) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
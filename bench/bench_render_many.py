@@ -0,0 +1,57 @@
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from block_markdown import markdown_to_html_node, render_many
+from corpus import generate, inline_paragraph, unordered_list
+
+from bench_pipeline import best_time, size_of
+
+
+def with_boilerplate(pages, seed):
+    rng = random.Random(seed)
+    header = unordered_list(rng, 6)
+    footer = "\n\n".join(inline_paragraph(rng) for _ in range(3))
+    return [f"{header}\n\n{page}\n\n{footer}" for page in pages]
+
+
+def single_calls(pages):
+    return [markdown_to_html_node(page).to_html() for page in pages]
+
+
+def batch_call(pages):
+    return list(render_many(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare render_many with a loop of single-document renders"
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pages = generate("many_small_pages", args.seed)
+    corpora = {
+        "unique pages": pages,
+        "shared header/footer": with_boilerplate(pages, args.seed),
+    }
+
+    for name, documents in corpora.items():
+        assert single_calls(documents) == batch_call(documents)
+
+        size = size_of(documents)
+        single = best_time(lambda: single_calls(documents), args.repeat)
+        batch = best_time(lambda: batch_call(documents), args.repeat)
+        print(
+            f"{name} ({len(documents)} pages, {size / 1e6:.2f} MB): "
+            f"single {size / single / 1e6:.2f} MB/s, "
+            f"render_many {size / batch / 1e6:.2f} MB/s ({single / batch:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
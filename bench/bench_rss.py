@@ -0,0 +1,129 @@
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from block_markdown import markdown_to_html_node, write_markdown_html
+from main import extract_title, stream_page
+from template import Template
+
+MODES = ["read", "lines", "mmap"]
+
+SECTION = """## Reference entry
+
+Plain words with **bold**, *italic* and `code` spans and a [link](https://example.com).
+
+* first item with `code`
+* second item
+
+```
+def example():
+    return 42
+```
+"""
+
+
+def write_source(path, megabytes):
+    with open(path, "w") as f:
+        f.write("# Generated reference\n\n")
+        written = 0
+        while written < megabytes * 1024 * 1024:
+            f.write(SECTION)
+            f.write("\n")
+            written += len(SECTION) + 1
+
+
+def render(mode, source, dest):
+    template = Template("<title>{{ Title }}</title>{{ Content }}")
+    if mode == "read":
+        with open(source, "r") as f:
+            markdown = f.read()
+        html = markdown_to_html_node(markdown).to_html()
+        page = template.render({"Title": extract_title(markdown), "Content": html})
+        with open(dest, "w") as f:
+            f.write(page)
+
+    elif mode == "lines":
+        with open(source, "r") as f:
+            title = extract_title(f)
+        with open(source, "r") as src, open(dest, "w") as out:
+            template.write(
+                out,
+                {"Title": title, "Content": lambda fp: write_markdown_html(src, fp)},
+            )
+
+    else:
+        stream_page(source, template, dest)
+
+
+def peak_rss_kib():
+    # ru_maxrss survives exec and can report the parent's peak, so prefer
+    # the high-water mark of this process image where Linux exposes it.
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child(mode, source, dest):
+    baseline = peak_rss_kib()
+    start = time.perf_counter()
+    render(mode, source, dest)
+    elapsed = time.perf_counter() - start
+    print(f"{baseline} {peak_rss_kib()} {elapsed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare peak RSS of read(), line streaming and mmap rendering"
+    )
+    parser.add_argument("--mb", type=int, default=50)
+    parser.add_argument("--mode", action="append", choices=MODES)
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "reference.md")
+        write_source(source, args.mb)
+        print(f"Source: {os.path.getsize(source) / 1024 / 1024:.0f} MiB")
+
+        outputs = {}
+        for mode in args.mode or MODES:
+            dest = os.path.join(directory, f"{mode}.html")
+            result = subprocess.run(
+                [sys.executable, __file__, "--child", mode, source, dest],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            baseline, peak, elapsed = result.stdout.split()
+            print(
+                f"{mode:>6}: peak RSS {int(peak) / 1024:7.1f} MiB "
+                f"(+{(int(peak) - int(baseline)) / 1024:.1f} MiB over startup), "
+                f"{float(elapsed):.1f} s"
+            )
+            with open(dest, "rb") as f:
+                outputs[mode] = f.read()
+            os.remove(dest)
+
+        if len(set(outputs.values())) > 1:
+            raise ValueError("Modes produced different output")
+
+
+if __name__ == "__main__":
+    main()
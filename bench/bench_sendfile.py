@@ -0,0 +1,118 @@
+import argparse
+import http.client
+import os
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server import StaticRequestHandler, ThreadPoolHTTPServer
+
+
+class QuietCopyHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class QuietSendfileHandler(StaticRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def start(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def download(port, path, rounds, headers=None):
+    conn = http.client.HTTPConnection("localhost", port)
+    received = 0
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+        while True:
+            chunk = response.read(1 << 20)
+            if not chunk:
+                break
+            received += len(chunk)
+    elapsed = time.perf_counter() - start_time
+    conn.close()
+    return received, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare copyfileobj and sendfile throughput for large files"
+    )
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "large.bin"), "wb") as f:
+            f.write(os.urandom(args.size_mb * 1024 * 1024))
+
+        servers = [
+            (
+                "copyfileobj",
+                HTTPServer(
+                    ("localhost", 0), partial(QuietCopyHandler, directory=directory)
+                ),
+            ),
+            (
+                "sendfile",
+                ThreadPoolHTTPServer(
+                    ("localhost", 0),
+                    partial(QuietSendfileHandler, directory=directory),
+                    workers=1,
+                ),
+            ),
+        ]
+
+        for name, server in servers:
+            start(server)
+            try:
+                download(server.server_port, "/large.bin", 1)
+                received, elapsed = download(
+                    server.server_port, "/large.bin", args.rounds
+                )
+                print(
+                    f"{name:>12}: {received / elapsed / 1024 / 1024:8.0f} MB/s "
+                    f"({args.rounds} x {args.size_mb} MB)"
+                )
+            finally:
+                server.shutdown()
+                server.server_close()
+
+        server = start(
+            ThreadPoolHTTPServer(
+                ("localhost", 0),
+                partial(QuietSendfileHandler, directory=directory),
+                workers=1,
+            )
+        )
+        try:
+            received, elapsed = download(
+                server.server_port,
+                "/large.bin",
+                args.rounds * 16,
+                headers={"Range": "bytes=-1048576"},
+            )
+            print(
+                f"{'range 1 MB':>12}: {received / elapsed / 1024 / 1024:8.0f} MB/s "
+                f"({args.rounds * 16} requests)"
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
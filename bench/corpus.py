@@ -0,0 +1,117 @@
+import random
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog while hobbits walk to mordor "
+    "and elves sing of elder days beneath the stars of varda"
+).split()
+
+
+def words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def plain_paragraph(rng):
+    return words(rng, rng.randint(30, 80)).capitalize() + "."
+
+
+def inline_paragraph(rng):
+    parts = []
+    for _ in range(rng.randint(20, 40)):
+        kind = rng.randrange(6)
+        text = words(rng, rng.randint(1, 4))
+        if kind == 0:
+            parts.append(f"**{text}**")
+        elif kind == 1:
+            parts.append(f"*{text}*")
+        elif kind == 2:
+            parts.append(f"`{text}`")
+        elif kind == 3:
+            parts.append(f"[{text}](https://example.com/{rng.randrange(1000)})")
+        elif kind == 4:
+            parts.append(f"![{text}](/images/{rng.randrange(1000)}.png)")
+        else:
+            parts.append(text)
+
+    return " ".join(parts) + " end."
+
+
+def unordered_list(rng, items):
+    return "\n".join(f"- {words(rng, rng.randint(3, 12))}" for _ in range(items))
+
+
+def ordered_list(rng, items):
+    return "\n".join(
+        f"{i}. {words(rng, rng.randint(3, 12))}" for i in range(1, items + 1)
+    )
+
+
+def code_block(rng, lines):
+    body = "\n".join(
+        f"    {rng.choice(WORDS)} = {rng.choice(WORDS)}({rng.randrange(100)})"
+        for _ in range(lines)
+    )
+    return f"```\n{body}\n```"
+
+
+def quote(rng):
+    return "\n".join(f"> {words(rng, rng.randint(5, 15))}" for _ in range(3))
+
+
+def mixed_page(rng, blocks):
+    parts = [f"# {words(rng, 3).title()}"]
+    for i in range(blocks):
+        kind = i % 8
+        if kind == 0:
+            parts.append(f"## {words(rng, 4).title()}")
+        elif kind in (1, 2, 3):
+            parts.append(plain_paragraph(rng))
+        elif kind == 4:
+            parts.append(inline_paragraph(rng))
+        elif kind == 5:
+            parts.append(unordered_list(rng, 5))
+        elif kind == 6:
+            parts.append(code_block(rng, 6))
+        else:
+            parts.append(quote(rng))
+
+    return "\n\n".join(parts)
+
+
+def many_small_pages(rng):
+    return [mixed_page(rng, 8) for _ in range(500)]
+
+
+def few_huge_pages(rng):
+    return [mixed_page(rng, 6000) for _ in range(2)]
+
+
+def inline_heavy(rng):
+    return ["# Inline\n\n" + "\n\n".join(inline_paragraph(rng) for _ in range(2000))]
+
+
+def long_lists(rng):
+    lists = []
+    for i in range(200):
+        if i % 2 == 0:
+            lists.append(unordered_list(rng, 50))
+        else:
+            lists.append(ordered_list(rng, 50))
+
+    return ["# Lists\n\n" + "\n\n".join(lists)]
+
+
+def big_code_blocks(rng):
+    return ["# Code\n\n" + "\n\n".join(code_block(rng, 500) for _ in range(40))]
+
+
+CORPORA = {
+    "many_small_pages": many_small_pages,
+    "few_huge_pages": few_huge_pages,
+    "inline_heavy": inline_heavy,
+    "long_lists": long_lists,
+    "big_code_blocks": big_code_blocks,
+}
+
+
+def generate(name, seed=0):
+    return CORPORA[name](random.Random(seed))
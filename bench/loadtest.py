@@ -0,0 +1,121 @@
+import argparse
+import http.client
+import os
+import threading
+import time
+
+
+def find_paths(root):
+    paths = []
+    for dir_path, _, files in os.walk(root):
+        for name in sorted(files):
+            rel_path = os.path.relpath(os.path.join(dir_path, name), root)
+            paths.append("/" + rel_path.replace(os.sep, "/"))
+
+    return sorted(paths)
+
+
+def client(host, port, paths, deadline, keep_alive, results):
+    latencies = []
+    errors = 0
+    conn = None
+    i = 0
+
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+
+        start = time.perf_counter()
+        try:
+            if conn is None:
+                conn = http.client.HTTPConnection(host, port, timeout=10)
+
+            headers = {} if keep_alive else {"Connection": "close"}
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors += 1
+
+            if not keep_alive or response.will_close:
+                conn.close()
+                conn = None
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            if conn is not None:
+                conn.close()
+            conn = None
+            continue
+
+        latencies.append(time.perf_counter() - start)
+
+    if conn is not None:
+        conn.close()
+
+    results.append((latencies, errors))
+
+
+def percentile(values, fraction):
+    if len(values) == 0:
+        return 0.0
+
+    index = min(len(values) - 1, int(len(values) * fraction))
+    return values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load test a running server.py against the files in public/"
+    )
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--dir", default="public", help="Directory to take paths from")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--no-keep-alive", action="store_true", help="Open a connection per request"
+    )
+    args = parser.parse_args()
+
+    paths = find_paths(args.dir)
+    if len(paths) == 0:
+        raise ValueError(f"No files to request under {args.dir}")
+
+    results = []
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(
+            target=client,
+            args=(
+                args.host,
+                args.port,
+                paths,
+                deadline,
+                not args.no_keep_alive,
+                results,
+            ),
+        )
+        for _ in range(args.clients)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result, _ in results for latency in result)
+    errors = sum(error for _, error in results)
+
+    print(f"{len(latencies)} requests, {errors} errors in {elapsed:.1f} s")
+    print(f"Throughput: {len(latencies) / elapsed:.0f} requests/s")
+    print(
+        f"Latency: p50 {percentile(latencies, 0.50) * 1000:.1f} ms, "
+        f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms, "
+        f"max {percentile(latencies, 1.0) * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
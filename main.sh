@@ -1,3 +1,2 @@
-rm -r public/
-python src/main.py
+python src/main.py "$@"
 python server.py --dir public
@@ -1,6 +1,402 @@
 import os
+import sys
 import argparse
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from email.utils import formatdate, parsedate_to_datetime
+from functools import partial
+from io import BytesIO
+from http.server import HTTPServer, ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+DEFAULT_WORKERS = 16
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+MAX_CACHED_FILE_BYTES = 4 * 1024 * 1024
+PRECOMPRESSED_ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = (
+    "<script>"
+    f'new EventSource("{LIVE_RELOAD_PATH}").onmessage = () => location.reload();'
+    "</script>"
+)
+
+
+def inject_live_reload(html):
+    index = html.rfind("</body>")
+    if index == -1:
+        return html + LIVE_RELOAD_SCRIPT
+
+    return html[:index] + LIVE_RELOAD_SCRIPT + html[index:]
+
+
+class LiveReload:
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def notify(self, *args):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait(self, version, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+class FileVersion:
+    def __init__(self, mtime_ns, size):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.mtime = mtime_ns // 10**9
+        self.etag = f'"{mtime_ns:x}-{size:x}"'
+        self.last_modified = formatdate(self.mtime, usegmt=True)
+
+
+class CachedFile(FileVersion):
+    def __init__(self, body, mtime_ns):
+        super().__init__(mtime_ns, len(body))
+        self.body = body
+
+
+class FileCache:
+    def __init__(
+        self, max_bytes=DEFAULT_CACHE_BYTES, max_file_bytes=MAX_CACHED_FILE_BYTES
+    ):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        stat = os.stat(path)
+        if stat.st_size > self.max_file_bytes:
+            return None
+
+        with self.lock:
+            entry = self.entries.get(path)
+            if (
+                entry is not None
+                and entry.mtime_ns == stat.st_mtime_ns
+                and len(entry.body) == stat.st_size
+            ):
+                self.entries.move_to_end(path)
+                return entry
+
+        with open(path, "rb") as f:
+            entry = CachedFile(f.read(), stat.st_mtime_ns)
+
+        with self.lock:
+            old = self.entries.pop(path, None)
+            if old is not None:
+                self.size -= len(old.body)
+
+            self.entries[path] = entry
+            self.size += len(entry.body)
+            while self.size > self.max_bytes and len(self.entries) > 0:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted.body)
+
+        return entry
+
+
+def parse_range(header, size):
+    # Returns an inclusive (start, end) byte range, None when the whole file
+    # should be sent, and raises ValueError when the range cannot be served.
+    if header is None or not header.startswith("bytes="):
+        return None
+
+    spec = header[len("bytes=") :].strip()
+    if "," in spec:
+        return None
+
+    first, sep, last = spec.partition("-")
+    first = first.strip()
+    last = last.strip()
+    if (
+        sep != "-"
+        or not (first.isdigit() or first == "")
+        or not (last.isdigit() or last == "")
+    ):
+        return None
+
+    if first == "":
+        if last == "" or int(last) == 0 or size == 0:
+            raise ValueError(f"Unsatisfiable range: {header}")
+
+        return max(0, size - int(last)), size - 1
+
+    start = int(first)
+    if last != "" and int(last) < start:
+        return None
+
+    if start >= size:
+        raise ValueError(f"Unsatisfiable range: {header}")
+
+    end = size - 1 if last == "" else min(int(last), size - 1)
+    return start, end
+
+
+def range_applies(version, if_range):
+    if if_range is None:
+        return True
+
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return if_range == version.etag
+
+    return if_range == version.last_modified
+
+
+def is_not_modified(entry, if_none_match, if_modified_since):
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or entry.etag in tags or f"W/{entry.etag}" in tags
+
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+        return since.timestamp() >= entry.mtime
+
+    return False
+
+
+def parse_accept_encoding(header):
+    accepted = {}
+    for item in header.split(","):
+        name, *params = item.split(";")
+        name = name.strip().lower()
+        if len(name) == 0:
+            continue
+
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        accepted[name] = quality
+
+    return accepted
+
+
+def choose_precompressed(path, accept_encoding):
+    if accept_encoding is None:
+        return None, path
+
+    accepted = parse_accept_encoding(accept_encoding)
+    source_mtime_ns = None
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) <= 0:
+            continue
+
+        try:
+            variant_mtime_ns = os.stat(path + suffix).st_mtime_ns
+        except FileNotFoundError:
+            continue
+
+        # Variants are stamped with their source's mtime; any other mtime
+        # means the source changed since it was compressed.
+        if source_mtime_ns is None:
+            source_mtime_ns = os.stat(path).st_mtime_ns
+        if variant_mtime_ns == source_mtime_ns:
+            return encoding, path + suffix
+
+    return None, path
+
+
+class ThreadPoolHTTPServer(HTTPServer):
+    def __init__(self, server_address, handler_class, workers=DEFAULT_WORKERS):
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class StaticRequestHandler(SimpleHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive between requests; the socket timeout
+    # frees a pooled worker from a client that goes idle. Headers and body are
+    # separate writes, so Nagle's algorithm would hold the body back until
+    # the client's delayed ACK on every reused connection.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    timeout = 5
+    file_cache = None
+
+    def send_head(self):
+        self.body_length = None
+
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split("?", 1)[0].endswith("/"):
+            path = os.path.join(path, "index.html")
+
+        if not os.path.isfile(path):
+            return super().send_head()
+
+        encoding, body_path = choose_precompressed(
+            path, self.headers.get("Accept-Encoding")
+        )
+
+        entry = None
+        if self.file_cache is not None:
+            entry = self.file_cache.get(body_path)
+
+        if entry is not None:
+            version = entry
+            body = BytesIO(entry.body)
+        else:
+            try:
+                body = open(body_path, "rb")
+            except OSError:
+                return super().send_head()
+
+            stat = os.fstat(body.fileno())
+            version = FileVersion(stat.st_mtime_ns, stat.st_size)
+
+        try:
+            return self.send_body_head(path, encoding, version, body)
+        except BaseException:
+            body.close()
+            raise
+
+    def send_body_head(self, path, encoding, version, body):
+        if is_not_modified(
+            version,
+            self.headers.get("If-None-Match"),
+            self.headers.get("If-Modified-Since"),
+        ):
+            self.send_response(304)
+            self.send_header("ETag", version.etag)
+            self.send_header("Last-Modified", version.last_modified)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            body.close()
+            return None
+
+        byte_range = None
+        if range_applies(version, self.headers.get("If-Range")):
+            try:
+                byte_range = parse_range(self.headers.get("Range"), version.size)
+            except ValueError:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{version.size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                body.close()
+                return None
+
+        if byte_range is None:
+            start, end = 0, version.size - 1
+            self.send_response(200)
+        else:
+            start, end = byte_range
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{version.size}")
+
+        self.body_length = end - start + 1
+        body.seek(start)
+
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Length", str(self.body_length))
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", version.etag)
+        self.send_header("Last-Modified", version.last_modified)
+        self.end_headers()
+        return body
+
+    def copyfile(self, source, outputfile):
+        if self.body_length is None:
+            super().copyfile(source, outputfile)
+            return
+
+        if isinstance(source, BytesIO):
+            outputfile.write(source.read(self.body_length))
+            return
+
+        # Regular files go straight from the page cache to the socket.
+        outputfile.flush()
+        if self.body_length > 0:
+            self.connection.sendfile(source, source.tell(), self.body_length)
+
+
+class DevRequestHandler(StaticRequestHandler):
+    live_reload = None
+
+    def do_GET(self):
+        if self.path == LIVE_RELOAD_PATH:
+            self.stream_reload_events()
+            return
+
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+
+        if not path.endswith(".html") or not os.path.isfile(path):
+            super().do_GET()
+            return
+
+        with open(path, "r") as f:
+            body = inject_live_reload(f.read()).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_reload_events(self):
+        # Read the version before the headers go out, so a rebuild finishing
+        # while the client connects is still reported.
+        version = self.live_reload.version
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        try:
+            while True:
+                new_version = self.live_reload.wait(version, timeout=15)
+                if new_version != version:
+                    version = new_version
+                    self.wfile.write(b"data: reload\n\n")
+                else:
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
 
 
 def run(
@@ -8,21 +404,107 @@ def run(
     handler_class=SimpleHTTPRequestHandler,
     port=8888,
     directory=None,
+    **server_kwargs,
 ):
-    if directory:
-        os.chdir(directory)
     server_address = ("", port)
-    httpd = server_class(server_address, handler_class)
+    handler = partial(handler_class, directory=directory)
+    httpd = server_class(server_address, handler, **server_kwargs)
     print(f"Serving HTTP on http://localhost:{port} from directory '{directory}'...")
     httpd.serve_forever()
 
 
+def static_handler_class(workers=DEFAULT_WORKERS, cache_bytes=DEFAULT_CACHE_BYTES):
+    attributes = {"file_cache": FileCache(cache_bytes) if cache_bytes > 0 else None}
+    # A single-threaded server would sit on an idle keep-alive connection
+    # until its timeout and make every other client wait, so it closes the
+    # connection after each response instead.
+    if workers <= 1:
+        attributes["protocol_version"] = "HTTP/1.0"
+
+    return type("CachingHandler", (StaticRequestHandler,), attributes)
+
+
+def run_static(
+    port=8888, directory=None, workers=DEFAULT_WORKERS, cache_bytes=DEFAULT_CACHE_BYTES
+):
+    handler_class = static_handler_class(workers, cache_bytes)
+    if workers <= 1:
+        run(HTTPServer, handler_class, port, directory)
+        return
+
+    run(ThreadPoolHTTPServer, handler_class, port, directory, workers=workers)
+
+
+def run_dev(port=8888, directory="public"):
+    # Building into the directory holding content/ and static/ would scatter
+    # pages, assets and build manifests among the sources.
+    for source in ("content", "static", "template.html"):
+        if os.path.exists(os.path.join(directory, source)):
+            raise ValueError(
+                f"Refusing to build into '{directory}': it contains '{source}'"
+            )
+
+    sys.path.insert(0, SRC_DIR)
+    from assets import sync_dir
+    from fragment_cache import DEFAULT_CACHE_DIR
+    from main import generate_pages_recursive
+    from watch import SiteWatcher
+
+    sync_dir("static/", directory)
+    generate_pages_recursive(
+        "content/", "template.html", directory, cache_dir=DEFAULT_CACHE_DIR
+    )
+
+    watcher = SiteWatcher(
+        "content/", "static/", "template.html", directory, DEFAULT_CACHE_DIR
+    )
+    live_reload = LiveReload()
+    threading.Thread(
+        target=watcher.run, kwargs={"on_rebuild": live_reload.notify}, daemon=True
+    ).start()
+
+    handler_class = type(
+        "LiveReloadHandler", (DevRequestHandler,), {"live_reload": live_reload}
+    )
+    try:
+        run(ThreadingHTTPServer, handler_class, port, directory)
+    finally:
+        watcher.save()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument(
-        "--dir", type=str, help="Directory to serve files from", default="."
+        "--dir",
+        type=str,
+        help="Directory to serve files from (default: public with --dev, . otherwise)",
     )
     parser.add_argument("--port", type=int, help="Port to serve HTTP on", default=8888)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker threads handling requests (1 serves one request at a time)",
+        default=DEFAULT_WORKERS,
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=int,
+        help="Memory used to cache file contents (0 disables the cache)",
+        default=DEFAULT_CACHE_BYTES // (1024 * 1024),
+    )
+    parser.add_argument(
+        "--dev",
+        action="store_true",
+        help="Build the site, rebuild it on changes and live-reload open pages",
+    )
     args = parser.parse_args()
 
-    run(port=args.port, directory=args.dir)
+    if args.dev:
+        run_dev(port=args.port, directory=args.dir or "public")
+    else:
+        run_static(
+            port=args.port,
+            directory=args.dir or ".",
+            workers=args.workers,
+            cache_bytes=args.cache_mb * 1024 * 1024,
+        )
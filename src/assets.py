@@ -0,0 +1,198 @@
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from manifest import hash_file
+
+DEFAULT_COPY_WORKERS = min(16, os.cpu_count() or 1)
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def assets_manifest_path(dest_dir_path):
+    return os.path.normpath(dest_dir_path) + ".assets.json"
+
+
+def scan_tree(src_dir, rel_dir=""):
+    files = []
+    dirs = []
+
+    with os.scandir(os.path.join(src_dir, rel_dir)) as entries:
+        for entry in entries:
+            rel_path = os.path.join(rel_dir, entry.name)
+            if entry.is_dir():
+                dirs.append(rel_path)
+                sub_files, sub_dirs = scan_tree(src_dir, rel_path)
+                files.extend(sub_files)
+                dirs.extend(sub_dirs)
+            else:
+                files.append(rel_path)
+
+    return files, dirs
+
+
+def is_unchanged(src_path, dest_path, checksum=False):
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+
+    src_stat = os.stat(src_path)
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+
+    if checksum:
+        return hash_file(src_path) == hash_file(dest_path)
+
+    return int(src_stat.st_mtime) == int(dest_stat.st_mtime)
+
+
+def copy_file(src_path, dest_path):
+    with open(src_path, "rb") as src, open(dest_path, "wb") as dest:
+        size = os.fstat(src.fileno()).st_size
+        if not kernel_copy(src.fileno(), dest.fileno(), size):
+            src.seek(0)
+            dest.seek(0)
+            dest.truncate()
+            shutil.copyfileobj(src, dest, COPY_CHUNK_SIZE)
+
+    shutil.copystat(src_path, dest_path)
+
+
+def kernel_copy(src_fd, dest_fd, size):
+    # Let the kernel move the bytes without a round trip through userspace
+    # buffers, preferring copy_file_range over sendfile where available.
+    copiers = []
+    if hasattr(os, "copy_file_range"):
+        copiers.append(
+            lambda offset: os.copy_file_range(
+                src_fd, dest_fd, COPY_CHUNK_SIZE, offset, offset
+            )
+        )
+    if hasattr(os, "sendfile"):
+        copiers.append(
+            lambda offset: os.sendfile(dest_fd, src_fd, offset, COPY_CHUNK_SIZE)
+        )
+
+    for copy_chunk in copiers:
+        offset = 0
+        try:
+            while offset < size:
+                copied = copy_chunk(offset)
+                if copied == 0:
+                    break
+
+                offset += copied
+        except OSError:
+            if offset > 0:
+                raise
+            continue
+
+        if offset == size:
+            return True
+
+    return False
+
+
+def place_file(src_path, dest_path, link=True):
+    if os.path.lexists(dest_path):
+        os.remove(dest_path)
+
+    # A hardlink costs no data copy when both trees share a filesystem;
+    # anything else falls back to a copy that keeps the source mtime.
+    if link:
+        try:
+            os.link(src_path, dest_path)
+            return "linked"
+        except OSError:
+            pass
+
+    copy_file(src_path, dest_path)
+    return "copied"
+
+
+def remove_empty_dirs(path, root):
+    root = os.path.normpath(root)
+    while os.path.normpath(path) != root and os.path.isdir(path):
+        if len(os.listdir(path)) > 0:
+            break
+
+        os.rmdir(path)
+        path = os.path.dirname(path)
+
+
+def load_synced_files(dest_dir_path):
+    try:
+        with open(assets_manifest_path(dest_dir_path), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def save_synced_files(dest_dir_path, files):
+    path = assets_manifest_path(dest_dir_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(sorted(files), f, indent=2)
+
+    os.replace(tmp_path, path)
+
+
+def sync_file(src_path, dest_path, checksum=False, link=True):
+    if is_unchanged(src_path, dest_path, checksum):
+        return "unchanged"
+
+    return place_file(src_path, dest_path, link)
+
+
+def sync_dir(
+    src_dir, dest_dir, checksum=False, link=True, workers=DEFAULT_COPY_WORKERS
+):
+    if not os.path.isdir(src_dir):
+        raise ValueError(f"Could not find source dir: {src_dir}")
+
+    summary = {"copied": 0, "linked": 0, "unchanged": 0, "removed": 0}
+
+    files, dirs = scan_tree(src_dir)
+    os.makedirs(dest_dir, exist_ok=True)
+    for rel_dir in dirs:
+        os.makedirs(os.path.join(dest_dir, rel_dir), exist_ok=True)
+
+    def sync_one(rel_path):
+        return sync_file(
+            os.path.join(src_dir, rel_path),
+            os.path.join(dest_dir, rel_path),
+            checksum,
+            link,
+        )
+
+    if workers > 1 and len(files) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(sync_one, files))
+    else:
+        results = map(sync_one, files)
+
+    for result in results:
+        summary[result] += 1
+
+    live = set(files)
+    for rel_path in load_synced_files(dest_dir):
+        if rel_path in live:
+            continue
+
+        dest_path = os.path.join(dest_dir, rel_path)
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+            summary["removed"] += 1
+
+        remove_empty_dirs(os.path.dirname(dest_path), dest_dir)
+
+    save_synced_files(dest_dir, files)
+
+    print(
+        f"Synced '{src_dir}' to '{dest_dir}': {summary['copied']} copied, "
+        f"{summary['linked']} linked, {summary['unchanged']} unchanged, "
+        f"{summary['removed']} removed"
+    )
+
+    return summary
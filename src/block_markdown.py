@@ -1,6 +1,9 @@
 from htmlnode import LeafNode, ParentNode
 from textnode import text_to_textnodes, text_node_to_html_node
 
+BATCH_MEMO_ENTRIES = 4096
+BATCH_MEMO_BLOCK_CHARS = 4096
+
 
 class BlockType:
     paragraph = "paragraph"
@@ -12,26 +15,47 @@ class BlockType:
 
 
 def markdown_to_blocks(markdown):
-    blocks = []
-    cur_block = ""
-    for line in markdown.split("\n"):
+    return list(iter_markdown_blocks(markdown.split("\n")))
+
+
+def iter_markdown_blocks(lines):
+    cur_block = []
+    for line in lines:
         stripped = line.strip()
         if len(stripped) > 0:
-            if len(cur_block) > 0:
-                cur_block += "\n"
-            cur_block += stripped
-        else:
-            if len(cur_block) > 0:
-                blocks.append(cur_block)
-                cur_block = ""
+            cur_block.append(stripped)
+        elif len(cur_block) > 0:
+            yield "\n".join(cur_block)
+            cur_block = []
 
     if len(cur_block) > 0:
-        blocks.append(cur_block)
+        yield "\n".join(cur_block)
+
 
-    return blocks
+class Block:
+    def __init__(self, block_type, text, items, level=0):
+        self.block_type = block_type
+        self.text = text
+        self.items = items
+        self.level = level
+
+    def __eq__(self, other):
+        return (
+            self.block_type == other.block_type
+            and self.text == other.text
+            and self.items == other.items
+            and self.level == other.level
+        )
+
+    def __repr__(self):
+        return f"Block({self.block_type}, {self.text}, {self.items}, {self.level})"
 
 
 def block_to_block_type(block):
+    return classify_block(block, block.split("\n"))
+
+
+def classify_block(block, lines):
     if check_heading_start(block):
         return BlockType.heading
 
@@ -43,17 +67,22 @@ def block_to_block_type(block):
     is_ordered = True
     next_num = 1
 
-    lines = block.split("\n")
     for line in lines:
-        if not check_line_start(line, ">"):
+        if is_quote and not check_line_start(line, ">"):
             is_quote = False
 
-        if not check_line_start(line, "* ") and not check_line_start(line, "- "):
+        if (
+            is_unordered
+            and not check_line_start(line, "* ")
+            and not check_line_start(line, "- ")
+        ):
             is_unordered = False
 
-        ordered, next_num = check_ordered_start(line, next_num)
-        if not ordered:
-            is_ordered = False
+        if is_ordered:
+            is_ordered, next_num = check_ordered_start(line, next_num)
+
+        if not is_quote and not is_unordered and not is_ordered:
+            return BlockType.paragraph
 
     if is_quote:
         return BlockType.quote
@@ -67,15 +96,39 @@ def block_to_block_type(block):
     return BlockType.paragraph
 
 
-def check_line_start(line, symbol):
-    if len(symbol) > len(line):
-        return False
+def parse_block(block):
+    lines = block.split("\n")
+    block_type = classify_block(block, lines)
 
-    for i in range(len(symbol)):
-        if line[i] != symbol[i]:
-            return False
+    if block_type == BlockType.heading:
+        level = 0
+        while block[level] == "#":
+            level += 1
+
+        return Block(block_type, block, [block.strip("# ")], level)
 
-    return True
+    if block_type == BlockType.code:
+        return Block(block_type, block, [block[3:-3].strip()])
+
+    if block_type == BlockType.quote:
+        return Block(block_type, block, [line.strip("> ") for line in lines])
+
+    if block_type == BlockType.unordered_list:
+        return Block(block_type, block, [line.strip(line[:2]) for line in lines])
+
+    if block_type == BlockType.ordered_list:
+        return Block(block_type, block, [line.strip("123456789. ") for line in lines])
+
+    return Block(block_type, block, [block])
+
+
+def check_block_type(block, block_type):
+    if block.block_type != block_type:
+        raise ValueError(f"Expected a {block_type} block, got a '{block.block_type}'")
+
+
+def check_line_start(line, symbol):
+    return line.startswith(symbol)
 
 
 def check_ordered_start(line, next_num):
@@ -83,193 +136,208 @@ def check_ordered_start(line, next_num):
 
 
 def check_heading_start(line):
-    is_heading = False
-
-    for i in range(1, 7):
-        heading_start = "#" * i + " "
-
-        if check_line_start(line, heading_start):
-            is_heading = True
-            break
+    level = 0
+    while level < len(line) and level < 7 and line[level] == "#":
+        level += 1
 
-    return is_heading
+    return 1 <= level <= 6 and line[level : level + 1] == " "
 
 
 def content_to_nodes(content):
     return list(map(text_node_to_html_node, text_to_textnodes(content)))
 
 
-def paragraph_to_html(block):
-    block_type = block_to_block_type(block)
-    if block_type != BlockType.paragraph:
-        raise ValueError(f"Expected a paragraph block, got a '{block_type}'")
+def render_paragraph(block):
+    return ParentNode("p", content_to_nodes(block.items[0]))
 
-    children = content_to_nodes(block)
 
-    return ParentNode("p", children)
+def render_quote(block):
+    children = []
+    for contents in block.items:
+        children.extend(content_to_nodes(contents + "<br>"))
 
+    return ParentNode("blockquote", children)
 
-def get_quote_contents(block):
-    block_type = block_to_block_type(block)
-    if block_type != BlockType.quote:
-        raise ValueError(f"Expected a quote block, got a '{block_type}'")
 
-    return block.strip("> ")
+def render_code(block):
+    return ParentNode("pre", [LeafNode("code", block.items[0])])
 
 
-def quote_to_html(block):
-    block_type = block_to_block_type(block)
-    if block_type != BlockType.quote:
-        raise ValueError(f"Expected a quote block, got a '{block_type}'")
+def render_heading(block):
+    return ParentNode(f"h{block.level}", content_to_nodes(block.items[0]))
+
 
+def render_list_items(tag, block):
     children = []
-    for line in block.split("\n"):
-        contents = get_quote_contents(line) + "<br>"
-        children.extend(content_to_nodes(contents))
+    for item in block.items:
+        children.append(ParentNode("li", content_to_nodes(item)))
 
-    return ParentNode("blockquote", children)
+    return ParentNode(tag, children)
 
 
-def get_code_contents(block):
-    block_type = block_to_block_type(block)
-    if block_type != BlockType.code:
-        raise ValueError(f"Expected a code block, got a '{block_type}'")
+def render_unordered(block):
+    return render_list_items("ul", block)
 
-    return block[3:-3].strip()
 
+def render_ordered(block):
+    return render_list_items("ol", block)
 
-def code_to_html(block):
-    block_type = block_to_block_type(block)
-    if block_type != BlockType.code:
-        raise ValueError(f"Expected a code block, got a '{block_type}'")
 
-    contents = get_code_contents(block)
+def paragraph_to_html(block):
+    parsed = parse_block(block)
+    check_block_type(parsed, BlockType.paragraph)
 
-    return ParentNode("pre", [LeafNode("code", contents)])
+    return render_paragraph(parsed)
 
 
-def get_heading_contents(block):
-    block_type = block_to_block_type(block)
-    if block_type != BlockType.heading:
-        raise ValueError(f"Expected a heading block, got a '{block_type}'")
+def get_quote_contents(block):
+    parsed = parse_block(block)
+    check_block_type(parsed, BlockType.quote)
 
-    return block.strip("# ")
+    return block.strip("> ")
 
 
-def get_heading_level(block):
-    block_type = block_to_block_type(block)
-    if block_type != BlockType.heading:
-        raise ValueError(f"Expected a heading block, got a '{block_type}'")
+def quote_to_html(block):
+    parsed = parse_block(block)
+    check_block_type(parsed, BlockType.quote)
 
-    level = 0
+    return render_quote(parsed)
 
-    for i in range(len(block)):
-        if block[i] != "#":
-            break
 
-        level += 1
+def get_code_contents(block):
+    parsed = parse_block(block)
+    check_block_type(parsed, BlockType.code)
 
-    return level
+    return parsed.items[0]
 
 
-def heading_to_html(block):
-    block_type = block_to_block_type(block)
-    if block_type != BlockType.heading:
-        raise ValueError(f"Expected a heading block, got a '{block_type}'")
+def code_to_html(block):
+    parsed = parse_block(block)
+    check_block_type(parsed, BlockType.code)
 
-    contents = get_heading_contents(block)
-    level = get_heading_level(block)
+    return render_code(parsed)
 
-    children = content_to_nodes(contents)
 
-    return ParentNode(f"h{level}", children)
+def get_heading_contents(block):
+    parsed = parse_block(block)
+    check_block_type(parsed, BlockType.heading)
 
+    return parsed.items[0]
 
-def get_unordered_items(block):
-    block_type = block_to_block_type(block)
-    if block_type != BlockType.unordered_list:
-        raise ValueError(f"Expected a unordered_list block, got a '{block_type}'")
-
-    contents = []
-    for line in block.split("\n"):
-        if line[0] == "*":
-            pattern = "* "
-        elif line[0] == "-":
-            pattern = "- "
-        else:
-            pattern = ""
 
-        contents.append(line.strip(pattern))
+def get_heading_level(block):
+    parsed = parse_block(block)
+    check_block_type(parsed, BlockType.heading)
 
-    return contents
+    return parsed.level
 
 
-def unordered_to_html(block):
-    block_type = block_to_block_type(block)
-    if block_type != BlockType.unordered_list:
-        raise ValueError(f"Expected a unordered_list block, got a '{block_type}'")
+def heading_to_html(block):
+    parsed = parse_block(block)
+    check_block_type(parsed, BlockType.heading)
 
-    html = ParentNode("ul", [])
+    return render_heading(parsed)
 
-    items = get_unordered_items(block)
-    for item in items:
-        children = content_to_nodes(item)
-        html.children.append(ParentNode("li", children))
 
-    return html
+def get_unordered_items(block):
+    parsed = parse_block(block)
+    check_block_type(parsed, BlockType.unordered_list)
 
+    return parsed.items
 
-def get_ordered_items(block):
-    block_type = block_to_block_type(block)
-    if block_type != BlockType.ordered_list:
-        raise ValueError(f"Expected a ordered_list block, got a '{block_type}'")
 
-    contents = []
-    for line in block.split("\n"):
-        contents.append(line.strip("123456789. "))
+def unordered_to_html(block):
+    parsed = parse_block(block)
+    check_block_type(parsed, BlockType.unordered_list)
+
+    return render_unordered(parsed)
 
-    return contents
+
+def get_ordered_items(block):
+    parsed = parse_block(block)
+    check_block_type(parsed, BlockType.ordered_list)
+
+    return parsed.items
 
 
 def ordered_to_html(block):
-    block_type = block_to_block_type(block)
-    if block_type != BlockType.ordered_list:
-        raise ValueError(f"Expected a ordered_list block, got a '{block_type}'")
+    parsed = parse_block(block)
+    check_block_type(parsed, BlockType.ordered_list)
 
-    html = ParentNode("ol", [])
+    return render_ordered(parsed)
 
-    items = get_ordered_items(block)
-    for item in items:
-        children = content_to_nodes(item)
-        html.children.append(ParentNode("li", children))
 
-    return html
+block_renderers = {
+    BlockType.paragraph: render_paragraph,
+    BlockType.heading: render_heading,
+    BlockType.quote: render_quote,
+    BlockType.code: render_code,
+    BlockType.unordered_list: render_unordered,
+    BlockType.ordered_list: render_ordered,
+}
 
 
-def block_to_html(block):
-    block_type = block_to_block_type(block)
+def render_block(block):
+    renderer = block_renderers.get(block.block_type)
+    if renderer is None:
+        raise ValueError(f"Unknown block type: {block.block_type}")
 
-    if block_type == BlockType.paragraph:
-        return paragraph_to_html(block)
-    if block_type == BlockType.heading:
-        return heading_to_html(block)
-    if block_type == BlockType.quote:
-        return quote_to_html(block)
-    if block_type == BlockType.code:
-        return code_to_html(block)
-    if block_type == BlockType.unordered_list:
-        return unordered_to_html(block)
-    if block_type == BlockType.ordered_list:
-        return ordered_to_html(block)
+    return renderer(block)
 
-    raise ValueError(f"Unknown block type: {block_type}")
+
+def block_to_html(block):
+    return render_block(parse_block(block))
 
 
 def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
+    if isinstance(markdown, str):
+        lines = markdown.split("\n")
+    else:
+        lines = markdown
 
     children = []
-    for block in blocks:
+    for block in iter_markdown_blocks(lines):
         children.append(block_to_html(block))
 
     return ParentNode("div", children)
+
+
+def write_markdown_html(lines, fp):
+    write_blocks_html(iter_markdown_blocks(lines), fp)
+
+
+def write_blocks_html(blocks, fp):
+    fp.write("<div>")
+    for block in blocks:
+        block_to_html(block).write_html(fp)
+
+    fp.write("</div>")
+
+
+def render_many(documents, memo_entries=BATCH_MEMO_ENTRIES):
+    # Blocks repeated across documents (shared headers, footers, notices)
+    # are parsed and serialized once per batch.
+    rendered = {}
+    parts = []
+    for markdown in documents:
+        if isinstance(markdown, str):
+            lines = markdown.split("\n")
+        else:
+            lines = markdown
+
+        parts.append("<div>")
+        for block in iter_markdown_blocks(lines):
+            html = rendered.get(block)
+            if html is None:
+                html = render_block(parse_block(block)).to_html()
+                if (
+                    len(block) <= BATCH_MEMO_BLOCK_CHARS
+                    and len(rendered) < memo_entries
+                ):
+                    rendered[block] = html
+
+            parts.append(html)
+        parts.append("</div>")
+
+        yield "".join(parts)
+        parts.clear()
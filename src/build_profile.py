@@ -0,0 +1,106 @@
+import time
+from contextlib import contextmanager, nullcontext
+
+from block_markdown import iter_markdown_blocks, parse_block, render_block
+from htmlnode import ParentNode
+
+_NULL_STAGE = nullcontext()
+
+
+class NullTimer:
+    enabled = False
+
+    def stage(self, name):
+        return _NULL_STAGE
+
+
+NULL_TIMER = NullTimer()
+
+
+class PageTimer:
+    enabled = True
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def total(self):
+        return sum(self.stages.values())
+
+
+def timed_markdown_to_html(markdown, timer):
+    with timer.stage("split"):
+        blocks = list(iter_markdown_blocks(markdown.split("\n")))
+
+    with timer.stage("classify"):
+        parsed = list(map(parse_block, blocks))
+
+    with timer.stage("inline"):
+        node = ParentNode("div", list(map(render_block, parsed)))
+
+    with timer.stage("serialize"):
+        return node.to_html()
+
+
+class BuildProfile:
+    def __init__(self):
+        self.stages = PageTimer()
+        self.pages = []
+
+    def stage(self, name):
+        return self.stages.stage(name)
+
+    def add_page(self, path, stages):
+        self.pages.append((path, stages))
+
+    def page_stage_totals(self):
+        totals = {}
+        for _, stages in self.pages:
+            for name, seconds in stages.items():
+                totals[name] = totals.get(name, 0.0) + seconds
+
+        return totals
+
+    def report(self, top=10):
+        lines = []
+
+        build_total = self.stages.total()
+        lines.append(f"Build stages ({build_total:.3f} s):")
+        lines.extend(format_stages(self.stages.stages, build_total))
+
+        page_totals = self.page_stage_totals()
+        page_total = sum(page_totals.values())
+        lines.append(
+            f"Page stages, summed over {len(self.pages)} page(s) ({page_total:.3f} s):"
+        )
+        lines.extend(format_stages(page_totals, page_total))
+
+        slowest = sorted(
+            self.pages, key=lambda page: sum(page[1].values()), reverse=True
+        )
+        lines.append("Slowest pages:")
+        for path, stages in slowest[:top]:
+            worst = max(stages, key=stages.get, default=None)
+            detail = "" if worst is None else f" (mostly {worst})"
+            lines.append(f"  {sum(stages.values()):9.3f} s  {path}{detail}")
+
+        return lines
+
+
+def format_stages(stages, total):
+    lines = []
+    for name, seconds in sorted(stages.items(), key=lambda item: -item[1]):
+        share = seconds / total * 100 if total > 0 else 0.0
+        lines.append(f"  {name:<10} {seconds:9.3f} s  {share:5.1f}%")
+
+    return lines
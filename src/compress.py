@@ -0,0 +1,126 @@
+import gzip
+import os
+
+from assets import load_synced_files
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {
+    ".html",
+    ".css",
+    ".js",
+    ".json",
+    ".svg",
+    ".txt",
+    ".xml",
+}
+MIN_COMPRESS_BYTES = 1024
+VARIANT_SUFFIXES = (".br", ".gz")
+
+
+def encodings():
+    if brotli is not None:
+        return [(".br", brotli.compress), (".gz", gzip_compress)]
+
+    return [(".gz", gzip_compress)]
+
+
+def gzip_compress(data):
+    # A fixed mtime keeps the output byte-for-byte reproducible.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def is_compressible(path):
+    return os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def is_fresh(variant_path, source_mtime_ns):
+    # Variants carry their source's exact mtime. A newer variant is not good
+    # enough: synced assets keep their original mtimes, so restoring an older
+    # file would otherwise leave the previous variant in place.
+    try:
+        return os.stat(variant_path).st_mtime_ns == source_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def compress_file(path, min_bytes=MIN_COMPRESS_BYTES, keep=()):
+    stat = os.stat(path)
+    written = []
+    if not is_compressible(path) or stat.st_size < min_bytes:
+        return written
+
+    data = None
+    for suffix, compress in encodings():
+        variant_path = path + suffix
+        if variant_path in keep or is_fresh(variant_path, stat.st_mtime_ns):
+            continue
+
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+
+        compressed = compress(data)
+        if len(compressed) >= len(data):
+            if os.path.exists(variant_path):
+                os.remove(variant_path)
+            continue
+
+        tmp_path = variant_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_path, variant_path)
+        written.append(variant_path)
+
+    return written
+
+
+def variant_paths(path):
+    return [path + suffix for suffix in VARIANT_SUFFIXES]
+
+
+def remove_variants(path):
+    for variant_path in variant_paths(path):
+        if os.path.exists(variant_path):
+            os.remove(variant_path)
+
+
+def is_stale_variant(path, min_bytes):
+    source, ext = os.path.splitext(path)
+    if ext not in VARIANT_SUFFIXES or not is_compressible(source):
+        return False
+
+    try:
+        return os.path.getsize(source) < min_bytes
+    except FileNotFoundError:
+        return True
+
+
+def precompress_dir(root, min_bytes=MIN_COMPRESS_BYTES):
+    summary = {"compressed": 0, "removed": 0}
+    # Files synced from static/ are left as they are, even when they look
+    # like variants (e.g. a hand-made sitemap.xml.gz).
+    static = set(os.path.join(root, path) for path in load_synced_files(root))
+
+    for dir_path, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(dir_path, name)
+            if path in static and not is_compressible(path):
+                continue
+
+            if is_stale_variant(path, min_bytes):
+                os.remove(path)
+                summary["removed"] += 1
+            elif is_compressible(path):
+                summary["compressed"] += len(compress_file(path, min_bytes, static))
+
+    print(
+        f"Precompressed '{root}': {summary['compressed']} written, "
+        f"{summary['removed']} removed"
+    )
+
+    return summary
@@ -0,0 +1,70 @@
+import hashlib
+import os
+
+from manifest import GENERATOR_VERSION
+
+DEFAULT_CACHE_DIR = ".cache/fragments"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class FragmentCache:
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def key(self, markdown):
+        digest = hashlib.sha256(GENERATOR_VERSION.encode())
+        digest.update(b"\0")
+        digest.update(markdown.encode())
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".html")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, "r") as f:
+                html = f.read()
+        except FileNotFoundError:
+            return None
+
+        # The modification time doubles as the last-used time for eviction.
+        os.utime(path)
+        return html
+
+    def put(self, key, html):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(html)
+
+        os.replace(tmp_path, path)
+
+    def evict(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        entries = []
+        total = 0
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+
+            for entry in os.scandir(shard.path):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+
+        removed = []
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+
+            os.remove(path)
+            removed.append(path)
+            total -= size
+
+        return removed
@@ -1,4 +1,6 @@
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -8,15 +10,18 @@ class HTMLNode:
     def to_html(self):
         raise NotImplementedError()
 
+    def iter_html(self):
+        raise NotImplementedError()
+
+    def write_html(self, fp):
+        for chunk in self.iter_html():
+            fp.write(chunk)
+
     def props_to_html(self):
         if self.props is None:
             return ""
 
-        html = ""
-        for prop in self.props:
-            html += f' {prop}="{self.props[prop]}"'
-
-        return html
+        return "".join(f' {prop}="{self.props[prop]}"' for prop in self.props)
 
     def __eq__(self, other):
         return (
@@ -31,6 +36,8 @@ class HTMLNode:
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, None, props)
 
@@ -41,28 +48,52 @@ class LeafNode(HTMLNode):
         if self.tag is None:
             return self.value
 
-        html = f"<{self.tag}"
+        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
 
-        html += self.props_to_html()
-        html += f">{self.value}</{self.tag}>"
+    def iter_html(self):
+        yield self.to_html()
 
-        return html
+    def write_html(self, fp):
+        fp.write(self.to_html())
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
 
-    def to_html(self):
+    def check_renderable(self):
         if self.tag is None:
             raise ValueError("ParentNode must have a tag")
 
         if self.children is None:
             raise ValueError("ParentNode must have children")
 
+    def to_html(self):
+        self.check_renderable()
+
         html = f"<{self.tag}>"
         for child in self.children:
             html += child.to_html()
 
         html += f"</{self.tag}>"
         return html
+
+    def iter_html(self):
+        self.check_renderable()
+
+        yield f"<{self.tag}>"
+        for child in self.children:
+            yield from child.iter_html()
+
+        yield f"</{self.tag}>"
+
+    def write_html(self, fp):
+        self.check_renderable()
+
+        fp.write(f"<{self.tag}>")
+        for child in self.children:
+            child.write_html(fp)
+
+        fp.write(f"</{self.tag}>")
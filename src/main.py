@@ -1,35 +1,32 @@
+import argparse
+import heapq
 import os
-import shutil
-from block_markdown import markdown_to_html_node
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from assets import load_synced_files, remove_empty_dirs, sync_dir
+from block_markdown import markdown_to_html_node, write_blocks_html
+from build_profile import NULL_TIMER, BuildProfile, PageTimer, timed_markdown_to_html
+from compress import precompress_dir, remove_variants
+from fragment_cache import DEFAULT_CACHE_DIR, FragmentCache
+from manifest import Manifest, hash_file, manifest_path
+from source_reader import iter_mapped_blocks, mapped_title, open_mapped
+from template import load_template
 
-
-def copy_dir_contents(src_dir, dest_dir):
-    if not os.path.exists(src_dir):
-        raise ValueError(f"Could not find source dir: {src_dir}")
-
-    if not os.path.exists(dest_dir):
-        os.mkdir(dest_dir)
-
-    src_contents = os.listdir(src_dir)
-
-    for content in src_contents:
-        src_path = os.path.join(src_dir, content)
-        dest_path = os.path.join(dest_dir, content)
-        if os.path.isfile(src_path):
-            print(f"Copying {src_path} to {dest_path}")
-            shutil.copy(src_path, dest_path)
-        else:
-            print(f"Making new dir {dest_path}")
-            os.mkdir(dest_path)
-            copy_dir_contents(src_path, dest_path)
+STREAM_THRESHOLD = 8 * 1024 * 1024
 
 
 def extract_title(markdown):
+    if isinstance(markdown, str):
+        lines = markdown.split("\n")
+    else:
+        lines = markdown
+
     title = ""
 
-    for line in markdown.split("\n"):
+    for line in lines:
         if line.startswith("# "):
-            title = line[2:]
+            title = line[2:].rstrip("\n")
 
     if len(title) == 0:
         raise ValueError("No level 1 heading found in markdown")
@@ -37,52 +34,509 @@ def extract_title(markdown):
     return title
 
 
-def generate_page(from_path, template_path, dest_path):
-    print(f"Generating page from '{from_path}' to '{
-          dest_path}' using '{template_path}'")
+def page_url(dest_path, dest_dir_path):
+    rel_path = os.path.relpath(dest_path, dest_dir_path).replace(os.sep, "/")
+    if rel_path == "index.html":
+        return "/"
+
+    if rel_path.endswith("/index.html"):
+        return "/" + rel_path[: -len("index.html")]
+
+    return "/" + rel_path
+
+
+def page_values(title, content, dest_path, dest_dir_path=None):
+    # The placeholders the build fills: {{ Title }}, {{ Content }} and, when
+    # the output root is known, {{ Path }} (the page's URL path).
+    values = {"Title": title, "Content": content}
+    if dest_dir_path is not None:
+        values["Path"] = page_url(dest_path, dest_dir_path)
+
+    return values
+
+
+def render_page(
+    from_path,
+    template,
+    dest_path,
+    cache=None,
+    timer=NULL_TIMER,
+    dest_dir_path=None,
+):
+    if os.path.getsize(from_path) >= STREAM_THRESHOLD:
+        with timer.stage("stream"):
+            stream_page(from_path, template, dest_path, dest_dir_path)
+        return
 
     markdown = ""
-    with open(from_path, "r") as f:
-        markdown = f.read()
+    with timer.stage("read"):
+        with open(from_path, "r") as f:
+            markdown = f.read()
+
+    html = None
+    if cache is not None:
+        with timer.stage("cache"):
+            key = cache.key(markdown)
+            html = cache.get(key)
+
+    if html is None:
+        if timer.enabled:
+            html = timed_markdown_to_html(markdown, timer)
+        else:
+            html = markdown_to_html_node(markdown).to_html()
+        if cache is not None:
+            with timer.stage("cache"):
+                cache.put(key, html)
+
+    with timer.stage("template"):
+        title = extract_title(markdown)
 
-    template = ""
-    with open(template_path, "r") as f:
-        template = f.read()
+        page = template.render(page_values(title, html, dest_path, dest_dir_path))
 
-    html = markdown_to_html_node(markdown).to_html()
+    with timer.stage("write"):
+        dest_dir = os.path.dirname(dest_path)
+        os.makedirs(dest_dir, exist_ok=True)
 
-    title = extract_title(markdown)
+        # Replacing the output instead of writing into it keeps a hardlinked
+        # static file from being overwritten through the link.
+        tmp_path = dest_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(page)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
-    page = template.replace("{{ Title }}", title)
-    page = page.replace("{{ Content }}", html)
+        os.replace(tmp_path, dest_path)
 
+
+def stream_page(from_path, template, dest_path, dest_dir_path=None):
     dest_dir = os.path.dirname(dest_path)
-    if not os.path.isdir(dest_dir):
-        os.makedirs(dest_dir)
+    os.makedirs(dest_dir, exist_ok=True)
+
+    tmp_path = dest_path + ".tmp"
+    try:
+        with open_mapped(from_path) as src:
+            title = mapped_title(src)
+            with open(tmp_path, "w") as dest:
+                content = lambda fp: write_blocks_html(iter_mapped_blocks(src), fp)
+                template.write(
+                    dest, page_values(title, content, dest_path, dest_dir_path)
+                )
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    os.replace(tmp_path, dest_path)
+
+
+_worker_template = None
+_worker_cache = None
+_worker_profile = False
+_worker_dest_dir = None
+
+
+def _init_worker(template_path, cache_dir, profile=False, dest_dir_path=None):
+    global _worker_template, _worker_cache, _worker_profile, _worker_dest_dir
+
+    _worker_template = load_template(template_path)
+    _worker_cache = FragmentCache(cache_dir) if cache_dir is not None else None
+    _worker_profile = profile
+    _worker_dest_dir = dest_dir_path
+
+
+def _render_in_worker(page):
+    from_path, dest_path = page
+    timer = PageTimer() if _worker_profile else NULL_TIMER
+    start = time.perf_counter()
+    try:
+        render_page(
+            from_path,
+            _worker_template,
+            dest_path,
+            _worker_cache,
+            timer,
+            _worker_dest_dir,
+        )
+    except Exception as e:
+        return f"{type(e).__name__}: {e}", time.perf_counter() - start, None
+
+    seconds = time.perf_counter() - start
+    return None, seconds, timer.stages if _worker_profile else None
+
+
+def _render_batch(batch):
+    return os.getpid(), list(map(_render_in_worker, batch))
+
+
+def plan_batches(pages, costs, count):
+    # Longest-processing-time first: hand each page, most expensive first, to
+    # the batch with the least work so far, then start the heaviest batches
+    # first so huge pages never start last.
+    count = min(count, len(pages))
+    batches = [[] for _ in range(count)]
+    heap = [(0.0, i) for i in range(count)]
+
+    for page in sorted(pages, key=lambda page: -costs.get(page[0], 0)):
+        total, i = heapq.heappop(heap)
+        batches[i].append(page)
+        heapq.heappush(heap, (total + costs.get(page[0], 0), i))
+
+    totals = dict((i, total) for total, i in heap)
+    order = sorted(range(count), key=lambda i: -totals[i])
+    return [batches[i] for i in order]
+
+
+def iter_batch_results(batch_results, worker_busy):
+    for pid, results in batch_results:
+        for result in results:
+            worker_busy[pid] = worker_busy.get(pid, 0.0) + result[1]
+            yield result
+
+
+def format_utilization(worker_busy, jobs, elapsed):
+    capacity = jobs * elapsed
+    busy = sum(worker_busy.values())
+    idle = max(0.0, capacity - busy)
+    share = busy / capacity * 100 if capacity > 0 else 0.0
+    # Workers that never received a batch were idle for the whole render.
+    busy_times = list(worker_busy.values()) + [0.0] * (jobs - len(worker_busy))
+    return (
+        f"Workers busy {share:.0f}% of {elapsed:.2f} s across {jobs} processes "
+        f"({idle:.2f} s idle, most idle worker {elapsed - min(busy_times):.2f} s)"
+    )
+
+
+def render_pages(
+    pages,
+    template_path,
+    jobs=1,
+    cache_dir=None,
+    profile=None,
+    costs=None,
+    render_times=None,
+    dest_dir_path=None,
+):
+    initargs = (template_path, cache_dir, profile is not None, dest_dir_path)
+    worker_busy = {}
+    start = time.perf_counter()
+    if jobs > 1 and len(pages) > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=initargs,
+        )
+        batches = plan_batches(pages, costs or {}, jobs * 4)
+        pages = [page for batch in batches for page in batch]
+        results = iter_batch_results(executor.map(_render_batch, batches), worker_busy)
+    else:
+        executor = None
+        _init_worker(*initargs)
+        results = map(_render_in_worker, pages)
+
+    failures = []
+    try:
+        for (from_path, dest_path), (error, seconds, stages) in zip(pages, results):
+            if stages is not None:
+                profile.add_page(from_path, stages)
+
+            if error is not None:
+                print(f"Failed to generate page from '{from_path}': {error}")
+                failures.append((from_path, error))
+                continue
+
+            if render_times is not None:
+                render_times[from_path] = seconds
+
+            print(
+                f"Generating page from '{from_path}' to '{dest_path}' using '{template_path}'"
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
-    with open(dest_path, "x") as f:
-        f.write(page)
+    if executor is not None:
+        print(format_utilization(worker_busy, jobs, time.perf_counter() - start))
 
+    return failures
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path):
-    dir_contents = os.listdir(dir_path_content)
 
-    for entry in dir_contents:
-        entry_path = os.path.join(dir_path_content, entry)
-        dest_path = os.path.join(dest_dir_path, entry)
+def estimate_costs(manifest, source_stats):
+    # Pages rendered before cost their last render time. Others are priced by
+    # size, converted to seconds with the rate measured on the known pages.
+    known_seconds = 0.0
+    known_bytes = 0
+    costs = {}
+    for source_path, (size, _) in source_stats.items():
+        seconds = manifest.render_seconds(source_path)
+        if seconds is not None:
+            costs[source_path] = seconds
+            known_seconds += seconds
+            known_bytes += size
 
-        if os.path.isfile(entry_path):
-            if entry[-3:] == ".md":
-                generate_page(entry_path, template_path, dest_path[:-3] + ".html")
+    seconds_per_byte = known_seconds / known_bytes if known_bytes > 0 else None
+    for source_path, (size, _) in source_stats.items():
+        if source_path in costs:
+            continue
 
+        if seconds_per_byte is None:
+            costs[source_path] = size
         else:
-            generate_pages_recursive(entry_path, template_path, dest_path)
+            costs[source_path] = size * seconds_per_byte
+
+    return costs
+
+
+def discover_pages(dir_path_content, dest_dir_path):
+    # One scandir walk yields (source, output, size, mtime_ns) per page, in
+    # sorted path order. Only markdown files are stat'ed.
+    pages = []
+
+    with os.scandir(dir_path_content) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+
+    for entry in entries:
+        dest_path = os.path.join(dest_dir_path, entry.name)
+
+        if entry.is_dir():
+            pages.extend(discover_pages(entry.path, dest_path))
+
+        elif entry.name[-3:] == ".md" and entry.is_file():
+            stat = entry.stat()
+            pages.append(
+                (entry.path, dest_path[:-3] + ".html", stat.st_size, stat.st_mtime_ns)
+            )
+
+    return pages
+
+
+def find_pages(dir_path_content, dest_dir_path):
+    return [
+        (from_path, dest_path)
+        for from_path, dest_path, _, _ in discover_pages(
+            dir_path_content, dest_dir_path
+        )
+    ]
+
+
+def remove_output(output_path, dest_dir_path):
+    if os.path.isfile(output_path):
+        print(f"Removing stale page {output_path}")
+        os.remove(output_path)
+
+    remove_variants(output_path)
+
+    remove_empty_dirs(os.path.dirname(output_path), dest_dir_path)
+
+
+def generate_pages_recursive(
+    dir_path_content,
+    template_path,
+    dest_dir_path,
+    full=False,
+    jobs=1,
+    cache_dir=None,
+    profile=None,
+    checksum=False,
+):
+    build_timer = profile.stages if profile is not None else NULL_TIMER
+
+    with build_timer.stage("scan"):
+        manifest = Manifest(manifest_path(dest_dir_path))
+        manifest.load()
+
+        template_hash = hash_file(template_path)
+        pages = discover_pages(dir_path_content, dest_dir_path)
+
+        assets = set(load_synced_files(dest_dir_path))
+        collisions = []
+
+        source_hashes = {}
+        source_stats = {}
+        stale_pages = []
+        for from_path, dest_path, size, mtime_ns in pages:
+            if os.path.relpath(dest_path, dest_dir_path) in assets:
+                collisions.append((from_path, dest_path))
+                continue
+
+            source_hash = None
+            if not checksum:
+                source_hash = manifest.cached_hash(from_path, size, mtime_ns)
+            if source_hash is None:
+                source_hash = hash_file(from_path)
+            source_hashes[from_path] = source_hash
+            source_stats[from_path] = (size, mtime_ns)
+
+            if full or not manifest.is_fresh(
+                from_path, source_hash, template_hash, dest_path
+            ):
+                stale_pages.append((from_path, dest_path))
+
+    costs = None
+    if jobs > 1:
+        costs = estimate_costs(manifest, source_stats)
+
+    render_times = {}
+    with build_timer.stage("render"):
+        failures = render_pages(
+            stale_pages,
+            template_path,
+            jobs,
+            cache_dir,
+            profile,
+            costs,
+            render_times,
+            dest_dir_path,
+        )
+    for from_path, dest_path in collisions:
+        error = f"'{dest_path}' is also a static file"
+        print(f"Failed to generate page from '{from_path}': {error}")
+        failures.append((from_path, error))
+    failed_sources = set(from_path for from_path, _ in failures)
+
+    with build_timer.stage("manifest"):
+        for from_path, dest_path in stale_pages:
+            if from_path not in failed_sources:
+                manifest.record(
+                    from_path,
+                    source_hashes[from_path],
+                    template_hash,
+                    dest_path,
+                    source_stats[from_path],
+                    render_times.get(from_path),
+                )
+
+        # A colliding page's output now belongs to a static file, so its
+        # entry is dropped without removing that output.
+        for from_path, _ in collisions:
+            manifest.forget(from_path)
+
+        stale_outputs = manifest.prune(set(source_hashes))
+        for output_path in stale_outputs:
+            remove_output(output_path, dest_dir_path)
+
+        manifest.save()
+
+    if cache_dir is not None:
+        with build_timer.stage("evict"):
+            FragmentCache(cache_dir).evict()
+
+    return failures
+
+
+def build(args, cache_dir, profile=None):
+    build_timer = profile.stages if profile is not None else NULL_TIMER
+
+    with build_timer.stage("assets"):
+        sync_dir("static/", "public/", checksum=args.checksum)
+
+    failures = generate_pages_recursive(
+        "content/",
+        "template.html",
+        "public/",
+        full=args.full,
+        jobs=args.jobs,
+        cache_dir=cache_dir,
+        profile=profile,
+        checksum=args.checksum,
+    )
+    if not args.no_compress:
+        with build_timer.stage("compress"):
+            precompress_dir("public/")
+
+    return failures
 
 
 def main():
-    copy_dir_contents("static/", "public/")
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Regenerate every page, ignoring the build manifest",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to render pages",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every page without reading or writing the fragment cache",
+    )
+    parser.add_argument(
+        "--checksum",
+        action="store_true",
+        help="Compare static files and pages by content hash instead of size "
+        "and mtime",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and rebuild affected files whenever sources change",
+    )
+    parser.add_argument(
+        "--no-compress",
+        action="store_true",
+        help="Skip writing precompressed .gz/.br siblings of text files",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each build stage and page and print the slowest ones",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="PATH",
+        help="Also run the build under cProfile and save the stats to PATH "
+        "(only the main process is profiled when --jobs > 1)",
+    )
+    args = parser.parse_args()
+    cache_dir = None if args.no_cache else DEFAULT_CACHE_DIR
+    profile = BuildProfile() if args.profile or args.profile_output else None
+
+    profiler = None
+    if args.profile_output is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    failures = build(args, cache_dir, profile)
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile_output)
+
+    if profile is not None:
+        print("\n".join(profile.report()))
+    if profiler is not None:
+        import pstats
+
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+        print(f"cProfile stats saved to {args.profile_output}")
+
+    if len(failures) > 0:
+        print(f"{len(failures)} page(s) failed to generate")
+        if not args.watch:
+            sys.exit(1)
+
+    if args.watch:
+        # Imported here because the watcher builds on this module's functions.
+        from watch import SiteWatcher
 
-    generate_pages_recursive("content/", "template.html", "public/")
+        SiteWatcher(
+            "content/",
+            "static/",
+            "template.html",
+            "public/",
+            cache_dir,
+            precompress=not args.no_compress,
+        ).run()
 
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import time
+
+GENERATOR_VERSION = "2"
+# Sources modified this recently are not trusted by size and mtime alone:
+# a second edit within the filesystem's timestamp granularity could keep both.
+RACY_WINDOW_NS = 2 * 10**9
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def manifest_path(dest_dir_path):
+    return os.path.normpath(dest_dir_path) + ".manifest.json"
+
+
+class Manifest:
+    def __init__(self, path):
+        self.path = path
+        self.pages = {}
+
+    def load(self):
+        if not os.path.isfile(self.path):
+            return
+
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            print(f"Ignoring unreadable build manifest: {self.path}")
+            return
+
+        self.pages = data.get("pages", {})
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"pages": self.pages}, f, indent=2, sort_keys=True)
+
+        os.replace(tmp_path, self.path)
+
+    def is_fresh(self, source_path, source_hash, template_hash, output_path):
+        entry = self.pages.get(source_path)
+        if entry is None:
+            return False
+
+        return (
+            entry["source_hash"] == source_hash
+            and entry["template_hash"] == template_hash
+            and entry["generator_version"] == GENERATOR_VERSION
+            and entry["output"] == output_path
+            and os.path.isfile(output_path)
+        )
+
+    def cached_hash(self, source_path, size, mtime_ns):
+        entry = self.pages.get(source_path)
+        if entry is None:
+            return None
+
+        if entry.get("size") != size or entry.get("mtime_ns") != mtime_ns:
+            return None
+
+        return entry["source_hash"]
+
+    def render_seconds(self, source_path):
+        entry = self.pages.get(source_path)
+        if entry is None:
+            return None
+
+        return entry.get("render_seconds")
+
+    def record(
+        self,
+        source_path,
+        source_hash,
+        template_hash,
+        output_path,
+        stat=None,
+        render_seconds=None,
+    ):
+        entry = {
+            "source_hash": source_hash,
+            "template_hash": template_hash,
+            "generator_version": GENERATOR_VERSION,
+            "output": output_path,
+        }
+        if stat is not None:
+            size, mtime_ns = stat
+            if mtime_ns + RACY_WINDOW_NS < time.time_ns():
+                entry["size"] = size
+                entry["mtime_ns"] = mtime_ns
+        if render_seconds is not None:
+            entry["render_seconds"] = round(render_seconds, 6)
+
+        self.pages[source_path] = entry
+
+    def forget(self, source_path):
+        self.pages.pop(source_path, None)
+
+    def prune(self, live_sources):
+        live_outputs = set()
+        for source in live_sources:
+            entry = self.pages.get(source)
+            if entry is not None:
+                live_outputs.add(entry["output"])
+
+        stale_outputs = []
+        for source in list(self.pages):
+            if source in live_sources:
+                continue
+
+            output = self.pages.pop(source)["output"]
+            if output not in live_outputs:
+                stale_outputs.append(output)
+
+        return stale_outputs
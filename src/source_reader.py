@@ -0,0 +1,94 @@
+import mmap
+import re
+from contextlib import contextmanager
+
+from block_markdown import iter_markdown_blocks
+
+# A newline, optional ASCII whitespace and another newline always ends a
+# block. Blank lines the bytes pattern misses (e.g. a line of non-breaking
+# spaces) are still split by iter_markdown_blocks on the decoded text.
+BLANK_LINE_PATTERN = re.compile(rb"\n[ \t\r\f\v]*\n")
+# Text-mode reads treat "\r", "\r\n" and "\n" as line endings, so a title may
+# follow any of them.
+TITLE_PATTERN = re.compile(rb"(?:^|\r)# ([^\r\n]*)", re.MULTILINE)
+# Mapped pages already parsed are dropped from the process once this many
+# bytes have been consumed; they stay in the page cache.
+RELEASE_BYTES = 1024 * 1024
+
+
+@contextmanager
+def open_mapped(path):
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            yield b""
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                buf.madvise(mmap.MADV_SEQUENTIAL)
+            yield buf
+
+
+def release(buf, start, end):
+    if not isinstance(buf, mmap.mmap) or not hasattr(mmap, "MADV_DONTNEED"):
+        return
+
+    start -= start % mmap.PAGESIZE
+    end -= end % mmap.PAGESIZE
+    if end > start:
+        buf.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+
+def decode_chunk(raw):
+    return raw.decode().replace("\r\n", "\n").replace("\r", "\n")
+
+
+def iter_windows(buf):
+    # Yields (start, end) spans of about RELEASE_BYTES that end just after a
+    # newline, so no line is split between two spans.
+    start = 0
+    while start < len(buf):
+        end = buf.find(b"\n", start + RELEASE_BYTES) + 1
+        if end == 0:
+            end = len(buf)
+
+        yield start, end
+        start = end
+
+
+def mapped_title(buf):
+    title = None
+    for start, end in iter_windows(buf):
+        for match in TITLE_PATTERN.finditer(buf, start, end):
+            title = match.group(1)
+
+        release(buf, start, end)
+
+    if title is None or len(title) == 0:
+        raise ValueError("No level 1 heading found in markdown")
+
+    return title.decode()
+
+
+def iter_mapped_blocks(buf):
+    # Each boundary is found with a fresh search so no scanner holds an export
+    # of the mapping while the generator is suspended; otherwise closing the
+    # mmap after a parse error raises BufferError and hides the real error.
+    pos = 0
+    released = 0
+    while True:
+        match = BLANK_LINE_PATTERN.search(buf, pos)
+        if match is None:
+            break
+
+        yield from iter_markdown_blocks(
+            decode_chunk(buf[pos : match.start()]).split("\n")
+        )
+        pos = match.end()
+
+        if pos - released >= RELEASE_BYTES:
+            release(buf, released, pos)
+            released = pos
+
+    yield from iter_markdown_blocks(decode_chunk(buf[pos:]).split("\n"))
+    release(buf, released, len(buf))
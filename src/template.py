@@ -0,0 +1,52 @@
+import re
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class Template:
+    def __init__(self, source):
+        self.segments = []
+        self.slots = []
+
+        pos = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            self.segments.append(source[pos : match.start()])
+            self.slots.append((match.group(1), match.group(0)))
+            pos = match.end()
+
+        self.segments.append(source[pos:])
+
+    def placeholders(self):
+        return set(name for name, _ in self.slots)
+
+    def render(self, values):
+        parts = [self.segments[0]]
+        for (name, placeholder), segment in zip(self.slots, self.segments[1:]):
+            parts.append(values.get(name, placeholder))
+            parts.append(segment)
+
+        return "".join(parts)
+
+    def write(self, fp, values):
+        # Values may be strings or callables that write their content to fp,
+        # so large slots can be streamed without building them in memory.
+        fp.write(self.segments[0])
+        for (name, placeholder), segment in zip(self.slots, self.segments[1:]):
+            value = values.get(name, placeholder)
+            if callable(value):
+                value(fp)
+            else:
+                fp.write(value)
+
+            fp.write(segment)
+
+    def __eq__(self, other):
+        return self.segments == other.segments and self.slots == other.slots
+
+    def __repr__(self):
+        return f"Template({self.segments}, {self.slots})"
+
+
+def load_template(template_path):
+    with open(template_path, "r") as f:
+        return Template(f.read())
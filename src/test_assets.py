@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from assets import (
+    assets_manifest_path,
+    copy_file,
+    is_unchanged,
+    scan_tree,
+    sync_dir,
+)
+
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.public = os.path.join(self.tmp.name, "public")
+
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.static, "images", "logo.png"), "png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def sync(self, **kwargs):
+        with redirect_stdout(StringIO()):
+            return sync_dir(self.static, self.public, **kwargs)
+
+    def test_scan_tree(self):
+        files, dirs = scan_tree(self.static)
+
+        self.assertEqual(
+            sorted(files),
+            sorted(["index.css", os.path.join("images", "logo.png")]),
+        )
+        self.assertEqual(dirs, ["images"])
+
+    def test_first_sync_places_everything(self):
+        summary = self.sync()
+
+        self.assertEqual(summary["copied"] + summary["linked"], 2)
+        self.assertEqual(self.read(os.path.join(self.public, "index.css")), "body {}")
+        self.assertTrue(os.path.isfile(assets_manifest_path(self.public)))
+
+    def test_second_sync_skips_unchanged(self):
+        self.sync()
+        summary = self.sync()
+
+        self.assertEqual(summary["unchanged"], 2)
+        self.assertEqual(summary["copied"] + summary["linked"], 0)
+
+    def test_replaced_file_is_synced(self):
+        self.sync()
+        css = os.path.join(self.static, "index.css")
+        os.remove(css)
+        self.write(css, "body { margin: 0 }")
+
+        summary = self.sync()
+
+        self.assertEqual(summary["copied"] + summary["linked"], 1)
+        self.assertEqual(
+            self.read(os.path.join(self.public, "index.css")), "body { margin: 0 }"
+        )
+
+    def test_removes_stale_assets_only(self):
+        self.sync()
+        page = os.path.join(self.public, "index.html")
+        self.write(page, "<p>generated</p>")
+        os.remove(os.path.join(self.static, "images", "logo.png"))
+
+        summary = self.sync()
+
+        self.assertEqual(summary["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "images")))
+        self.assertTrue(os.path.isfile(page))
+
+    def test_checksum_detects_same_size_change(self):
+        self.sync()
+        dest = os.path.join(self.public, "index.css")
+        os.remove(dest)
+        self.write(dest, "body []")
+        src_stat = os.stat(os.path.join(self.static, "index.css"))
+        os.utime(dest, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+
+        self.assertTrue(is_unchanged(os.path.join(self.static, "index.css"), dest))
+        self.assertFalse(
+            is_unchanged(os.path.join(self.static, "index.css"), dest, checksum=True)
+        )
+
+    def test_copy_file(self):
+        src = os.path.join(self.tmp.name, "big.bin")
+        dest = os.path.join(self.tmp.name, "copy.bin")
+        data = os.urandom(3 * 1024 * 1024 + 17)
+        with open(src, "wb") as f:
+            f.write(data)
+
+        copy_file(src, dest)
+
+        with open(dest, "rb") as f:
+            self.assertEqual(f.read(), data)
+        self.assertTrue(is_unchanged(src, dest))
+
+    def test_copy_empty_file(self):
+        src = os.path.join(self.tmp.name, "empty")
+        dest = os.path.join(self.tmp.name, "empty.copy")
+        self.write(src, "")
+
+        copy_file(src, dest)
+
+        self.assertEqual(self.read(dest), "")
+
+    def test_sync_without_links_copies(self):
+        summary = self.sync(link=False, workers=4)
+
+        self.assertEqual(summary["copied"], 2)
+        dest = os.path.join(self.public, "images", "logo.png")
+        src = os.path.join(self.static, "images", "logo.png")
+        self.assertNotEqual(os.stat(dest).st_ino, os.stat(src).st_ino)
+        self.assertEqual(self.read(dest), "png")
+
+    def test_missing_source(self):
+        with self.assertRaises(ValueError):
+            sync_dir(os.path.join(self.tmp.name, "missing"), self.public)
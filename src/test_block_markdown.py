@@ -1,6 +1,8 @@
 import unittest
+from io import StringIO
 from block_markdown import (
     markdown_to_blocks,
+    iter_markdown_blocks,
     block_to_block_type,
     BlockType,
     paragraph_to_html,
@@ -13,6 +15,10 @@ from block_markdown import (
     unordered_to_html,
     ordered_to_html,
     markdown_to_html_node,
+    parse_block,
+    Block,
+    get_heading_level,
+    render_many,
 )
 
 from htmlnode import ParentNode, LeafNode
@@ -80,6 +86,23 @@ This is the same paragraph on a new line
 
         self.assertEqual(blocks, [])
 
+    def test_iter_blocks_from_file(self):
+        lines = StringIO("# Title\n\n  Indented line  \r\nnext line\n\n\n* item\n")
+
+        blocks = iter_markdown_blocks(lines)
+
+        self.assertEqual(next(blocks), "# Title")
+        self.assertEqual(next(blocks), "Indented line\nnext line")
+        self.assertEqual(list(blocks), ["* item"])
+
+    def test_iter_blocks_matches_markdown_to_blocks(self):
+        markdown = "a\n\n\nb\nc\n  \n d \n"
+
+        self.assertEqual(
+            list(iter_markdown_blocks(StringIO(markdown))),
+            markdown_to_blocks(markdown),
+        )
+
     # Block to block type
     def test_headings(self):
         blocks = [
@@ -381,6 +404,46 @@ This is the same paragraph on a new line
             ),
         )
 
+    def test_markdown_to_html_node_from_lines(self):
+        markdown = "# Title\n\nSome *text*\n\n1. one\n2. two\n"
+
+        self.assertEqual(
+            markdown_to_html_node(StringIO(markdown)),
+            markdown_to_html_node(markdown),
+        )
+
+    def test_parse_block(self):
+        self.assertEqual(
+            parse_block("### Heading *three*"),
+            Block(BlockType.heading, "### Heading *three*", ["Heading *three*"], 3),
+        )
+        self.assertEqual(
+            parse_block("```\ncode\n```"),
+            Block(BlockType.code, "```\ncode\n```", ["code"]),
+        )
+        self.assertEqual(
+            parse_block("> one\n> two"),
+            Block(BlockType.quote, "> one\n> two", ["one", "two"]),
+        )
+        self.assertEqual(
+            parse_block("* one\n- two"),
+            Block(BlockType.unordered_list, "* one\n- two", ["one", "two"]),
+        )
+        self.assertEqual(
+            parse_block("1. one\n2. two"),
+            Block(BlockType.ordered_list, "1. one\n2. two", ["one", "two"]),
+        )
+        self.assertEqual(
+            parse_block("Just text"),
+            Block(BlockType.paragraph, "Just text", ["Just text"]),
+        )
+
+    def test_get_heading_level(self):
+        self.assertEqual(get_heading_level("###### Six"), 6)
+
+        with self.assertRaises(ValueError):
+            get_heading_level("####### Seven")
+
     def test_markdown_to_html_node(self):
         markdown = """# This is the title
 
@@ -447,3 +510,26 @@ return i
                 ],
             ),
         )
+
+    def test_render_many_matches_single_render(self):
+        documents = [
+            "# First\n\nShared **footer**",
+            "# Second\n\n* one\n* two\n\nShared **footer**",
+            "",
+            "Shared **footer**",
+        ]
+
+        self.assertEqual(
+            list(render_many(documents)),
+            [markdown_to_html_node(md).to_html() for md in documents],
+        )
+        self.assertEqual(
+            list(render_many(documents, memo_entries=0)),
+            [markdown_to_html_node(md).to_html() for md in documents],
+        )
+
+    def test_render_many_accepts_lines(self):
+        self.assertEqual(
+            list(render_many([iter(["# Title\n", "\n", "Body\n"])])),
+            ["<div><h1>Title</h1><p>Body</p></div>"],
+        )
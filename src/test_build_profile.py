@@ -0,0 +1,48 @@
+import unittest
+
+from block_markdown import markdown_to_html_node
+from build_profile import BuildProfile, PageTimer, timed_markdown_to_html
+
+
+class TestBuildProfile(unittest.TestCase):
+    def test_timed_render_matches_render(self):
+        markdown = "# Title\n\nSome **bold** text\n\n- one\n- two\n\n```\ncode\n```"
+        timer = PageTimer()
+
+        self.assertEqual(
+            timed_markdown_to_html(markdown, timer),
+            markdown_to_html_node(markdown).to_html(),
+        )
+        self.assertEqual(
+            sorted(timer.stages), ["classify", "inline", "serialize", "split"]
+        )
+
+    def test_page_timer_accumulates(self):
+        timer = PageTimer()
+        timer.add("read", 1.0)
+        timer.add("read", 0.5)
+        timer.add("write", 0.25)
+
+        self.assertEqual(timer.stages, {"read": 1.5, "write": 0.25})
+        self.assertEqual(timer.total(), 1.75)
+
+    def test_report_sorts_slowest_first(self):
+        profile = BuildProfile()
+        profile.stages.add("render", 2.0)
+        profile.stages.add("assets", 1.0)
+        profile.add_page("fast.md", {"read": 0.1})
+        profile.add_page("slow.md", {"read": 0.1, "inline": 0.9})
+
+        report = profile.report()
+
+        self.assertEqual(report[0], "Build stages (3.000 s):")
+        self.assertIn("render", report[1])
+        self.assertIn("assets", report[2])
+        self.assertEqual(profile.page_stage_totals(), {"read": 0.2, "inline": 0.9})
+        slowest = report.index("Slowest pages:")
+        self.assertEqual(report[slowest + 1], "      1.000 s  slow.md (mostly inline)")
+        self.assertEqual(report[slowest + 2], "      0.100 s  fast.md (mostly read)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import gzip
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from assets import save_synced_files
+from compress import compress_file, is_stale_variant, precompress_dir
+
+
+class TestCompress(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.root, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_compress_file(self):
+        data = b"body { margin: 0 }\n" * 200
+        path = self.write("index.css", data)
+
+        written = compress_file(path)
+
+        self.assertIn(path + ".gz", written)
+        with open(path + ".gz", "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()), data)
+
+    def test_compress_is_reproducible(self):
+        path = self.write("index.html", b"<p>text</p>" * 500)
+        compress_file(path)
+        with open(path + ".gz", "rb") as f:
+            first = f.read()
+
+        os.remove(path + ".gz")
+        compress_file(path)
+        with open(path + ".gz", "rb") as f:
+            self.assertEqual(f.read(), first)
+
+    def test_fresh_variant_is_skipped(self):
+        path = self.write("index.css", b"a {}\n" * 500)
+        compress_file(path)
+
+        self.assertEqual(compress_file(path), [])
+
+    def test_restored_older_source_is_recompressed(self):
+        path = self.write("index.css", b"a { color: red }\n" * 500)
+        compress_file(path)
+        stat = os.stat(path)
+
+        self.write("index.css", b"a { color: blue }\n" * 500)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+
+        self.assertIn(path + ".gz", compress_file(path))
+        with open(path + ".gz", "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()), b"a { color: blue }\n" * 500)
+        self.assertEqual(os.stat(path + ".gz").st_mtime_ns, os.stat(path).st_mtime_ns)
+
+    def test_skips_small_and_binary_files(self):
+        small = self.write("small.css", b"a {}")
+        image = self.write("image.png", b"\0" * 5000)
+
+        self.assertEqual(compress_file(small), [])
+        self.assertEqual(compress_file(image), [])
+
+    def test_stale_variant(self):
+        self.write("gone.html.gz", b"")
+        self.write("archive.tar.gz", b"")
+
+        self.assertTrue(is_stale_variant(os.path.join(self.root, "gone.html.gz"), 0))
+        self.assertFalse(is_stale_variant(os.path.join(self.root, "archive.tar.gz"), 0))
+
+    def test_precompress_dir(self):
+        self.write("index.html", b"<p>text</p>" * 500)
+        self.write("old.html.gz", b"")
+
+        with redirect_stdout(StringIO()):
+            summary = precompress_dir(self.root)
+
+        self.assertGreaterEqual(summary["compressed"], 1)
+        self.assertEqual(summary["removed"], 1)
+        self.assertTrue(os.path.exists(os.path.join(self.root, "index.html.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.root, "old.html.gz")))
+
+    def test_precompress_dir_keeps_static_variants(self):
+        public = os.path.join(self.root, "public")
+        os.makedirs(public)
+        self.write(os.path.join("public", "sitemap.xml.gz"), b"static sitemap")
+        self.write(os.path.join("public", "feed.xml"), b"<item/>" * 500)
+        self.write(os.path.join("public", "feed.xml.gz"), b"static feed")
+        save_synced_files(public, ["feed.xml", "feed.xml.gz", "sitemap.xml.gz"])
+
+        with redirect_stdout(StringIO()):
+            summary = precompress_dir(public)
+
+        self.assertEqual(summary["removed"], 0)
+        with open(os.path.join(public, "sitemap.xml.gz"), "rb") as f:
+            self.assertEqual(f.read(), b"static sitemap")
+        with open(os.path.join(public, "feed.xml.gz"), "rb") as f:
+            self.assertEqual(f.read(), b"static feed")
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from fragment_cache import FragmentCache
+
+
+class TestFragmentCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, "fragments")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_miss(self):
+        cache = FragmentCache(self.cache_dir)
+
+        self.assertIsNone(cache.get(cache.key("# Title")))
+
+    def test_put_and_get(self):
+        cache = FragmentCache(self.cache_dir)
+        key = cache.key("# Title")
+
+        cache.put(key, "<div><h1>Title</h1></div>")
+
+        self.assertEqual(cache.get(key), "<div><h1>Title</h1></div>")
+
+    def test_key_depends_on_content(self):
+        cache = FragmentCache(self.cache_dir)
+
+        self.assertEqual(cache.key("a"), cache.key("a"))
+        self.assertNotEqual(cache.key("a"), cache.key("b"))
+
+    def test_evicts_least_recently_used(self):
+        cache = FragmentCache(self.cache_dir, max_bytes=20)
+        keys = [cache.key(str(i)) for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, "x" * 10)
+            os.utime(cache.path(key), ns=(i * 10**9, i * 10**9))
+
+        cache.get(keys[0])
+        removed = cache.evict()
+
+        self.assertEqual(removed, [cache.path(keys[1])])
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+    def test_evict_empty(self):
+        cache = FragmentCache(self.cache_dir)
+
+        self.assertEqual(cache.evict(), [])
@@ -1,5 +1,5 @@
 import unittest
-from htmlnode import HTMLNode
+from htmlnode import HTMLNode, LeafNode, ParentNode
 
 
 class TestHtmlNode(unittest.TestCase):
@@ -16,3 +16,15 @@ class TestHtmlNode(unittest.TestCase):
         self.assertEqual(
             html, ' href="https://www.google.com" alt="Link to google website"'
         )
+
+    def test_no_instance_dict(self):
+        nodes = [
+            HTMLNode("p", "text"),
+            LeafNode("b", "bold"),
+            ParentNode("p", [LeafNode(None, "text")]),
+        ]
+
+        for node in nodes:
+            self.assertFalse(hasattr(node, "__dict__"))
+            with self.assertRaises(AttributeError):
+                node.extra = True
@@ -0,0 +1,346 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from contextlib import redirect_stdout
+from io import StringIO
+
+import main
+from assets import sync_dir
+from main import (
+    discover_pages,
+    estimate_costs,
+    extract_title,
+    format_utilization,
+    generate_pages_recursive,
+    page_url,
+    plan_batches,
+    render_page,
+    stream_page,
+)
+from manifest import Manifest, manifest_path
+from template import load_template
+
+
+class TestMain(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        self.template = os.path.join(self.tmp.name, "template.html")
+
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\nPosts")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def build(self, **kwargs):
+        out = StringIO()
+        with redirect_stdout(out):
+            generate_pages_recursive(self.content, self.template, self.public, **kwargs)
+        return out.getvalue()
+
+    def test_extract_title(self):
+        self.assertEqual(extract_title("# Hello\n\ntext"), "Hello")
+
+        with self.assertRaises(ValueError):
+            extract_title("No heading")
+
+    def test_extract_title_from_lines(self):
+        lines = StringIO("intro\n# First\n\n# Last\n")
+
+        self.assertEqual(extract_title(lines), "Last")
+
+    def test_stream_page_matches_render_page(self):
+        source = os.path.join(self.content, "long.md")
+        self.write(
+            source,
+            "# Long\n\n" + "A *para*\nwith `code`\n\n* one\n* two\n\n" * 50,
+        )
+        template = load_template(self.template)
+        rendered = os.path.join(self.public, "rendered.html")
+        streamed = os.path.join(self.public, "streamed.html")
+
+        render_page(source, template, rendered)
+        stream_page(source, template, streamed)
+
+        self.assertEqual(self.read(streamed), self.read(rendered))
+
+    def test_stream_page_failure_leaves_no_output(self):
+        source = os.path.join(self.content, "broken.md")
+        self.write(source, "# Broken\n\nunclosed **bold")
+        dest = os.path.join(self.public, "broken.html")
+
+        with self.assertRaises(ValueError):
+            stream_page(source, load_template(self.template), dest)
+
+        self.assertEqual(os.listdir(self.public), [])
+
+    def test_stream_page_reports_error_in_middle_block(self):
+        source = os.path.join(self.content, "broken.md")
+        self.write(source, "# T\n\nok\n\nbad *italic\n\nmore\n")
+        dest = os.path.join(self.public, "broken.html")
+
+        with self.assertRaises(ValueError) as ctx:
+            stream_page(source, load_template(self.template), dest)
+
+        self.assertIn("missing closing *", str(ctx.exception))
+        self.assertEqual(os.listdir(self.public), [])
+
+    def test_generates_pages(self):
+        self.build()
+
+        self.assertEqual(
+            self.read(os.path.join(self.public, "index.html")),
+            "<title>Home</title><div><h1>Home</h1><p>Welcome</p></div>",
+        )
+        self.assertTrue(os.path.isfile(os.path.join(self.public, "blog", "index.html")))
+
+    def test_skips_unchanged_pages(self):
+        self.build()
+        log = self.build()
+
+        self.assertNotIn("Generating page", log)
+
+    def test_rebuilds_changed_page_only(self):
+        self.build()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nChanged")
+        log = self.build()
+
+        self.assertIn("index.md", log)
+        self.assertNotIn("blog", log)
+        self.assertIn("Changed", self.read(os.path.join(self.public, "index.html")))
+
+    def test_template_change_rebuilds_all(self):
+        self.build()
+        self.write(self.template, "<h2>{{ Title }}</h2>{{ Content }}")
+        log = self.build()
+
+        self.assertEqual(log.count("Generating page"), 2)
+
+    def test_full_rebuilds_all(self):
+        self.build()
+        log = self.build(full=True)
+
+        self.assertEqual(log.count("Generating page"), 2)
+
+    def test_removes_deleted_pages(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "index.md"))
+        self.build()
+
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+        self.assertTrue(os.path.isfile(os.path.join(self.public, "index.html")))
+
+    def test_parallel_build_matches_serial(self):
+        self.build()
+        serial = self.read(os.path.join(self.public, "blog", "index.html"))
+
+        self.build(full=True, jobs=2)
+
+        self.assertEqual(
+            self.read(os.path.join(self.public, "blog", "index.html")), serial
+        )
+
+    def test_failed_page_does_not_abort_build(self):
+        self.write(os.path.join(self.content, "broken.md"), "No title **here")
+        out = StringIO()
+        with redirect_stdout(out):
+            failures = generate_pages_recursive(
+                self.content, self.template, self.public, jobs=2
+            )
+
+        self.assertEqual(
+            [source for source, _ in failures],
+            [os.path.join(self.content, "broken.md")],
+        )
+        self.assertIn("Failed to generate page", out.getvalue())
+        self.assertTrue(os.path.isfile(os.path.join(self.public, "index.html")))
+        self.assertTrue(os.path.isfile(os.path.join(self.public, "blog", "index.html")))
+
+    def test_failed_page_is_retried(self):
+        self.write(os.path.join(self.content, "broken.md"), "No title")
+        self.build()
+        log = self.build()
+
+        self.assertIn("broken.md", log)
+
+    def test_page_colliding_with_static_file_is_reported(self):
+        static = os.path.join(self.tmp.name, "static")
+        self.write(os.path.join(static, "404.html"), "<h1>Static</h1>")
+        self.write(os.path.join(self.content, "404.md"), "# Missing\n\nGone")
+        with redirect_stdout(StringIO()):
+            sync_dir(static, self.public)
+            failures = generate_pages_recursive(
+                self.content, self.template, self.public
+            )
+
+        self.assertEqual(
+            failures,
+            [
+                (
+                    os.path.join(self.content, "404.md"),
+                    f"'{os.path.join(self.public, '404.html')}' is also a static file",
+                )
+            ],
+        )
+        self.assertEqual(self.read(os.path.join(static, "404.html")), "<h1>Static</h1>")
+        self.assertEqual(
+            self.read(os.path.join(self.public, "404.html")), "<h1>Static</h1>"
+        )
+
+    def test_render_page_replaces_linked_output(self):
+        static_path = os.path.join(self.tmp.name, "static.html")
+        dest_path = os.path.join(self.public, "index.html")
+        self.write(static_path, "<h1>Static</h1>")
+        os.makedirs(self.public)
+        os.link(static_path, dest_path)
+
+        render_page(
+            os.path.join(self.content, "index.md"),
+            load_template(self.template),
+            dest_path,
+        )
+
+        self.assertEqual(self.read(static_path), "<h1>Static</h1>")
+        self.assertIn("Welcome", self.read(dest_path))
+        self.assertFalse(os.path.exists(dest_path + ".tmp"))
+
+    def test_template_change_reuses_cached_fragments(self):
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        self.build(cache_dir=cache_dir)
+        self.write(self.template, "<h2>{{ Title }}</h2>{{ Content }}")
+
+        with mock.patch.object(
+            main, "markdown_to_html_node", side_effect=AssertionError("parsed")
+        ):
+            self.build(cache_dir=cache_dir)
+
+        self.assertEqual(
+            self.read(os.path.join(self.public, "index.html")),
+            "<h2>Home</h2><div><h1>Home</h1><p>Welcome</p></div>",
+        )
+
+    def test_discover_pages(self):
+        self.write(os.path.join(self.content, "notes.txt"), "not a page")
+
+        pages = discover_pages(self.content, self.public)
+
+        self.assertEqual(
+            [(source, output) for source, output, _, _ in pages],
+            [
+                (
+                    os.path.join(self.content, "blog", "index.md"),
+                    os.path.join(self.public, "blog", "index.html"),
+                ),
+                (
+                    os.path.join(self.content, "index.md"),
+                    os.path.join(self.public, "index.html"),
+                ),
+            ],
+        )
+        stat = os.stat(os.path.join(self.content, "index.md"))
+        self.assertEqual(pages[1][2:], (stat.st_size, stat.st_mtime_ns))
+
+    def test_unchanged_stat_skips_hashing(self):
+        for source in ("index.md", os.path.join("blog", "index.md")):
+            os.utime(os.path.join(self.content, source), (1, 1))
+        self.build()
+
+        with mock.patch.object(main, "hash_file", wraps=main.hash_file) as hash_file:
+            self.build()
+            self.assertEqual(hash_file.call_count, 1)
+
+            self.build(checksum=True)
+            self.assertEqual(hash_file.call_count, 4)
+
+    def test_plan_batches_starts_largest_first(self):
+        pages = [(f"{name}.md", f"{name}.html") for name in "abcdef"]
+        costs = {"a.md": 1, "b.md": 50, "c.md": 2, "d.md": 3, "e.md": 40, "f.md": 4}
+
+        batches = plan_batches(pages, costs, 3)
+
+        self.assertEqual(
+            batches,
+            [
+                [("b.md", "b.html")],
+                [("e.md", "e.html")],
+                [
+                    ("f.md", "f.html"),
+                    ("d.md", "d.html"),
+                    ("c.md", "c.html"),
+                    ("a.md", "a.html"),
+                ],
+            ],
+        )
+        self.assertEqual(len(plan_batches(pages, {}, 16)), 6)
+
+    def test_estimate_costs(self):
+        manifest = Manifest(os.path.join(self.tmp.name, "m.json"))
+        manifest.record("known.md", "h", "t", "known.html", None, 2.0)
+
+        self.assertEqual(
+            estimate_costs(manifest, {"known.md": (100, 0), "new.md": (300, 0)}),
+            {"known.md": 2.0, "new.md": 6.0},
+        )
+        self.assertEqual(
+            estimate_costs(Manifest("unused.json"), {"new.md": (300, 0)}),
+            {"new.md": 300},
+        )
+
+    def test_format_utilization(self):
+        self.assertEqual(
+            format_utilization({1: 1.5, 2: 0.5}, 3, 1.0),
+            "Workers busy 67% of 1.00 s across 3 processes "
+            "(1.00 s idle, most idle worker 1.00 s)",
+        )
+
+    def test_records_render_times(self):
+        log = self.build(jobs=2)
+
+        self.assertIn("Workers busy", log)
+        manifest = Manifest(manifest_path(self.public))
+        manifest.load()
+        self.assertIsNotNone(
+            manifest.render_seconds(os.path.join(self.content, "index.md"))
+        )
+
+    def test_page_url(self):
+        self.assertEqual(page_url("public/index.html", "public/"), "/")
+        self.assertEqual(page_url("public/blog/index.html", "public"), "/blog/")
+        self.assertEqual(page_url("public/about.html", "public"), "/about.html")
+
+    def test_path_placeholder(self):
+        self.write(self.template, "{{ Path }}|{{ Title }}")
+
+        for jobs in (1, 2):
+            self.build(full=True, jobs=jobs)
+
+            self.assertEqual(
+                self.read(os.path.join(self.public, "index.html")), "/|Home"
+            )
+            self.assertEqual(
+                self.read(os.path.join(self.public, "blog", "index.html")),
+                "/blog/|Blog",
+            )
+
+    def test_stream_page_fills_path(self):
+        source = os.path.join(self.content, "index.md")
+        self.write(self.template, "{{ Path }}")
+        template = load_template(self.template)
+        dest = os.path.join(self.public, "docs", "index.html")
+
+        stream_page(source, template, dest, self.public)
+
+        self.assertEqual(self.read(dest), "/docs/")
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import time
+import unittest
+
+from manifest import Manifest, hash_file, manifest_path
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.output = os.path.join(self.dir, "index.html")
+        with open(self.output, "w") as f:
+            f.write("<p>page</p>")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_manifest_path(self):
+        self.assertEqual(manifest_path("public/"), "public.manifest.json")
+
+    def test_hash_file(self):
+        path = os.path.join(self.dir, "a.md")
+        with open(path, "w") as f:
+            f.write("# Title")
+
+        self.assertEqual(hash_file(path), hash_file(path))
+        self.assertEqual(len(hash_file(path)), 64)
+
+    def test_fresh_after_record(self):
+        manifest = Manifest(os.path.join(self.dir, "m.json"))
+        manifest.record("a.md", "src", "tmpl", self.output)
+
+        self.assertTrue(manifest.is_fresh("a.md", "src", "tmpl", self.output))
+        self.assertFalse(manifest.is_fresh("a.md", "changed", "tmpl", self.output))
+        self.assertFalse(manifest.is_fresh("a.md", "src", "changed", self.output))
+        self.assertFalse(manifest.is_fresh("b.md", "src", "tmpl", self.output))
+
+    def test_missing_output_is_stale(self):
+        manifest = Manifest(os.path.join(self.dir, "m.json"))
+        manifest.record("a.md", "src", "tmpl", self.output)
+        os.remove(self.output)
+
+        self.assertFalse(manifest.is_fresh("a.md", "src", "tmpl", self.output))
+
+    def test_save_and_load(self):
+        path = os.path.join(self.dir, "m.json")
+        manifest = Manifest(path)
+        manifest.record("a.md", "src", "tmpl", self.output)
+        manifest.save()
+
+        loaded = Manifest(path)
+        loaded.load()
+
+        self.assertEqual(loaded.pages, manifest.pages)
+
+    def test_load_corrupt(self):
+        path = os.path.join(self.dir, "m.json")
+        with open(path, "w") as f:
+            f.write("{not json")
+
+        manifest = Manifest(path)
+        manifest.load()
+
+        self.assertEqual(manifest.pages, {})
+
+    def test_prune(self):
+        manifest = Manifest(os.path.join(self.dir, "m.json"))
+        manifest.record("a.md", "src", "tmpl", "public/a.html")
+        manifest.record("b.md", "src", "tmpl", "public/b.html")
+
+        stale = manifest.prune({"a.md"})
+
+        self.assertEqual(stale, ["public/b.html"])
+        self.assertEqual(list(manifest.pages), ["a.md"])
+
+    def test_cached_hash_matches_stat(self):
+        manifest = Manifest(os.path.join(self.dir, "m.json"))
+        manifest.record("a.md", "src", "tmpl", self.output, (10, 1000))
+
+        self.assertEqual(manifest.cached_hash("a.md", 10, 1000), "src")
+        self.assertIsNone(manifest.cached_hash("a.md", 11, 1000))
+        self.assertIsNone(manifest.cached_hash("a.md", 10, 1001))
+        self.assertIsNone(manifest.cached_hash("b.md", 10, 1000))
+
+    def test_recently_modified_source_is_not_cached(self):
+        manifest = Manifest(os.path.join(self.dir, "m.json"))
+        mtime_ns = time.time_ns()
+        manifest.record("a.md", "src", "tmpl", self.output, (10, mtime_ns))
+
+        self.assertIsNone(manifest.cached_hash("a.md", 10, mtime_ns))
+        self.assertTrue(manifest.is_fresh("a.md", "src", "tmpl", self.output))
@@ -1,4 +1,5 @@
 import unittest
+from io import StringIO
 from htmlnode import ParentNode, LeafNode
 
 
@@ -56,3 +57,38 @@ class TestParentNode(unittest.TestCase):
             html,
             "<div><ul><li>First item</li><li>Second item</li><li>Third item</li></ul><p>This is the <b>most important</b> paragraph there is</p></div>",
         )
+
+    def test_iter_html(self):
+        node = ParentNode(
+            "p",
+            [LeafNode(None, "Normal text"), LeafNode("b", "Bold text")],
+        )
+
+        self.assertEqual(
+            list(node.iter_html()),
+            ["<p>", "Normal text", "<b>Bold text</b>", "</p>"],
+        )
+
+    def test_write_html(self):
+        node = ParentNode(
+            "div",
+            [ParentNode("p", [LeafNode("i", "Italic")]), LeafNode(None, "Tail")],
+        )
+        out = StringIO()
+
+        node.write_html(out)
+
+        self.assertEqual(out.getvalue(), node.to_html())
+        self.assertEqual(out.getvalue(), "<div><p><i>Italic</i></p>Tail</div>")
+
+    def test_missing_tag(self):
+        node = ParentNode("div", [ParentNode(None, [LeafNode(None, "text")])])
+
+        with self.assertRaises(ValueError):
+            node.to_html()
+
+    def test_missing_children(self):
+        node = ParentNode("div", None)
+
+        with self.assertRaises(ValueError):
+            node.to_html()
@@ -0,0 +1,388 @@
+import gzip
+import http.client
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from functools import partial
+from http.server import HTTPServer, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server import (
+    LIVE_RELOAD_PATH,
+    LIVE_RELOAD_SCRIPT,
+    DevRequestHandler,
+    FileCache,
+    LiveReload,
+    StaticRequestHandler,
+    ThreadPoolHTTPServer,
+    choose_precompressed,
+    inject_live_reload,
+    parse_accept_encoding,
+    parse_range,
+    run_dev,
+    static_handler_class,
+)
+
+
+class QuietHandler(StaticRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class CachingHandler(QuietHandler):
+    file_cache = FileCache()
+
+
+class TestServer(unittest.TestCase):
+    def test_inject_live_reload(self):
+        html = inject_live_reload("<html><body><p>Hi</p></body></html>")
+
+        self.assertEqual(
+            html, f"<html><body><p>Hi</p>{LIVE_RELOAD_SCRIPT}</body></html>"
+        )
+
+    def test_inject_live_reload_without_body(self):
+        self.assertEqual(
+            inject_live_reload("<p>Hi</p>"), "<p>Hi</p>" + LIVE_RELOAD_SCRIPT
+        )
+
+    def test_live_reload_wait(self):
+        live_reload = LiveReload()
+
+        self.assertEqual(live_reload.wait(0, timeout=0), 0)
+
+        live_reload.notify(["public/index.html"])
+
+        self.assertEqual(live_reload.wait(0, timeout=0), 1)
+
+    def test_thread_pool_server_keep_alive(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "index.html"), "w") as f:
+                f.write("<p>Hi</p>")
+
+            handler = partial(QuietHandler, directory=directory)
+            httpd = ThreadPoolHTTPServer(("localhost", 0), handler, workers=2)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            try:
+                conn = http.client.HTTPConnection("localhost", httpd.server_port)
+                for _ in range(2):
+                    conn.request("GET", "/index.html")
+                    response = conn.getresponse()
+
+                    self.assertEqual(response.status, 200)
+                    self.assertEqual(response.read(), b"<p>Hi</p>")
+                    self.assertFalse(response.will_close)
+                conn.close()
+                self.assertTrue(QuietHandler.disable_nagle_algorithm)
+            finally:
+                httpd.shutdown()
+                httpd.server_close()
+
+    def test_file_cache_hit_and_invalidation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.css")
+            with open(path, "w") as f:
+                f.write("body {}")
+
+            cache = FileCache()
+            entry = cache.get(path)
+
+            self.assertEqual(entry.body, b"body {}")
+            self.assertIs(cache.get(path), entry)
+
+            with open(path, "w") as f:
+                f.write("body { margin: 0 }")
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+            updated = cache.get(path)
+
+            self.assertEqual(updated.body, b"body { margin: 0 }")
+            self.assertNotEqual(updated.etag, entry.etag)
+            self.assertEqual(cache.size, len(updated.body))
+
+    def test_file_cache_eviction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for name in ("a", "b", "c"):
+                paths.append(os.path.join(directory, name))
+                with open(paths[-1], "w") as f:
+                    f.write("x" * 10)
+
+            cache = FileCache(max_bytes=20, max_file_bytes=15)
+            cache.get(paths[0])
+            cache.get(paths[1])
+            cache.get(paths[0])
+            cache.get(paths[2])
+
+            self.assertEqual(list(cache.entries), [paths[0], paths[2]])
+            self.assertEqual(cache.size, 20)
+
+    def test_file_cache_skips_large_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "big.bin")
+            with open(path, "wb") as f:
+                f.write(b"x" * 100)
+
+            self.assertIsNone(FileCache(max_file_bytes=50).get(path))
+
+    def test_conditional_get(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "index.html"), "w") as f:
+                f.write("<p>Hi</p>")
+
+            handler = partial(CachingHandler, directory=directory)
+            httpd = ThreadPoolHTTPServer(("localhost", 0), handler, workers=2)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            try:
+                conn = http.client.HTTPConnection("localhost", httpd.server_port)
+                conn.request("GET", "/")
+                response = conn.getresponse()
+                self.assertEqual(response.read(), b"<p>Hi</p>")
+                etag = response.getheader("ETag")
+                last_modified = response.getheader("Last-Modified")
+
+                conn.request("GET", "/index.html", headers={"If-None-Match": etag})
+                response = conn.getresponse()
+                response.read()
+                self.assertEqual(response.status, 304)
+
+                conn.request(
+                    "GET", "/index.html", headers={"If-Modified-Since": last_modified}
+                )
+                response = conn.getresponse()
+                response.read()
+                self.assertEqual(response.status, 304)
+
+                conn.request("GET", "/index.html", headers={"If-None-Match": '"other"'})
+                response = conn.getresponse()
+                self.assertEqual(response.status, 200)
+                self.assertEqual(response.read(), b"<p>Hi</p>")
+                conn.close()
+            finally:
+                httpd.shutdown()
+                httpd.server_close()
+
+    def test_parse_accept_encoding(self):
+        self.assertEqual(
+            parse_accept_encoding("gzip, br;q=0.5, identity;q=0"),
+            {"gzip": 1.0, "br": 0.5, "identity": 0.0},
+        )
+
+    def test_choose_precompressed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.css")
+            for name in ("index.css", "index.css.gz"):
+                with open(os.path.join(directory, name), "w") as f:
+                    f.write(name)
+            stat = os.stat(path)
+            os.utime(path + ".gz", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+            self.assertEqual(
+                choose_precompressed(path, "gzip, deflate"), ("gzip", path + ".gz")
+            )
+            self.assertEqual(choose_precompressed(path, "gzip;q=0"), (None, path))
+            self.assertEqual(choose_precompressed(path, None), (None, path))
+
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.assertEqual(choose_precompressed(path, "gzip"), (None, path))
+
+            # An older source restored over a newer one is stale as well.
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+            self.assertEqual(choose_precompressed(path, "gzip"), (None, path))
+
+    def test_serves_precompressed_variant(self):
+        with tempfile.TemporaryDirectory() as directory:
+            body = b"body { margin: 0 }" * 100
+            with open(os.path.join(directory, "index.css"), "wb") as f:
+                f.write(body)
+            with open(os.path.join(directory, "index.css.gz"), "wb") as f:
+                f.write(gzip.compress(body))
+            stat = os.stat(os.path.join(directory, "index.css"))
+            os.utime(
+                os.path.join(directory, "index.css.gz"),
+                ns=(stat.st_atime_ns, stat.st_mtime_ns),
+            )
+
+            handler = partial(CachingHandler, directory=directory)
+            httpd = ThreadPoolHTTPServer(("localhost", 0), handler, workers=2)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            try:
+                conn = http.client.HTTPConnection("localhost", httpd.server_port)
+                conn.request("GET", "/index.css", headers={"Accept-Encoding": "gzip"})
+                response = conn.getresponse()
+
+                self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+                self.assertEqual(response.getheader("Content-Type"), "text/css")
+                self.assertEqual(gzip.decompress(response.read()), body)
+
+                conn.request("GET", "/index.css")
+                response = conn.getresponse()
+
+                self.assertIsNone(response.getheader("Content-Encoding"))
+                self.assertEqual(response.read(), body)
+                conn.close()
+            finally:
+                httpd.shutdown()
+                httpd.server_close()
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range("bytes=0-9", 100), (0, 9))
+        self.assertEqual(parse_range("bytes=90-", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=-10", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=50-500", 100), (50, 99))
+        self.assertEqual(parse_range("bytes=-500", 100), (0, 99))
+        self.assertIsNone(parse_range(None, 100))
+        self.assertIsNone(parse_range("items=0-9", 100))
+        self.assertIsNone(parse_range("bytes=0-9,20-29", 100))
+        self.assertIsNone(parse_range("bytes=9-0", 100))
+        self.assertIsNone(parse_range("bytes=a-b", 100))
+
+        with self.assertRaises(ValueError):
+            parse_range("bytes=100-", 100)
+        with self.assertRaises(ValueError):
+            parse_range("bytes=-0", 100)
+
+    def test_range_request(self):
+        with tempfile.TemporaryDirectory() as directory:
+            body = bytes(range(256)) * 64
+            with open(os.path.join(directory, "data.bin"), "wb") as f:
+                f.write(body)
+
+            handler = partial(QuietHandler, directory=directory)
+            httpd = ThreadPoolHTTPServer(("localhost", 0), handler, workers=2)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            try:
+                conn = http.client.HTTPConnection("localhost", httpd.server_port)
+                conn.request("GET", "/data.bin")
+                response = conn.getresponse()
+                self.assertEqual(response.status, 200)
+                self.assertEqual(response.getheader("Accept-Ranges"), "bytes")
+                self.assertEqual(response.read(), body)
+                etag = response.getheader("ETag")
+
+                conn.request("GET", "/data.bin", headers={"Range": "bytes=100-199"})
+                response = conn.getresponse()
+                self.assertEqual(response.status, 206)
+                self.assertEqual(
+                    response.getheader("Content-Range"), f"bytes 100-199/{len(body)}"
+                )
+                self.assertEqual(response.read(), body[100:200])
+
+                conn.request(
+                    "GET",
+                    "/data.bin",
+                    headers={"Range": "bytes=-10", "If-Range": '"stale"'},
+                )
+                response = conn.getresponse()
+                self.assertEqual(response.status, 200)
+                self.assertEqual(response.read(), body)
+
+                conn.request(
+                    "GET", "/data.bin", headers={"Range": "bytes=-10", "If-Range": etag}
+                )
+                response = conn.getresponse()
+                self.assertEqual(response.status, 206)
+                self.assertEqual(response.read(), body[-10:])
+
+                conn.request("GET", "/data.bin", headers={"Range": "bytes=99999-"})
+                response = conn.getresponse()
+                self.assertEqual(response.status, 416)
+                self.assertEqual(
+                    response.getheader("Content-Range"), f"bytes */{len(body)}"
+                )
+                response.read()
+                conn.close()
+            finally:
+                httpd.shutdown()
+                httpd.server_close()
+
+    def test_single_worker_closes_connections(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "index.html"), "w") as f:
+                f.write("<p>Hi</p>")
+
+            handler_class = type(
+                "QuietCachingHandler",
+                (static_handler_class(workers=1),),
+                {"log_message": QuietHandler.log_message},
+            )
+            handler = partial(handler_class, directory=directory)
+            httpd = HTTPServer(("localhost", 0), handler)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            try:
+                idle = http.client.HTTPConnection("localhost", httpd.server_port)
+                idle.request("GET", "/index.html")
+                self.assertEqual(idle.getresponse().read(), b"<p>Hi</p>")
+
+                # The idle connection is left open; the next client is still
+                # served well before the handler's keep-alive timeout.
+                conn = http.client.HTTPConnection(
+                    "localhost", httpd.server_port, timeout=2
+                )
+                conn.request("GET", "/index.html")
+                response = conn.getresponse()
+                self.assertEqual(response.status, 200)
+                self.assertEqual(response.read(), b"<p>Hi</p>")
+                conn.close()
+                idle.close()
+            finally:
+                httpd.shutdown()
+                httpd.server_close()
+
+    def test_dev_handler(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "index.html"), "w") as f:
+                f.write("<html><body><p>Hi</p></body></html>")
+
+            live_reload = LiveReload()
+            handler_class = type(
+                "QuietDevHandler",
+                (DevRequestHandler,),
+                {"live_reload": live_reload, "log_message": QuietHandler.log_message},
+            )
+            handler = partial(handler_class, directory=directory)
+            httpd = ThreadingHTTPServer(("localhost", 0), handler)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            try:
+                conn = http.client.HTTPConnection(
+                    "localhost", httpd.server_port, timeout=5
+                )
+                conn.request("GET", "/")
+                response = conn.getresponse()
+                self.assertEqual(response.status, 200)
+                self.assertEqual(response.getheader("Cache-Control"), "no-store")
+                self.assertEqual(
+                    response.read().decode(),
+                    f"<html><body><p>Hi</p>{LIVE_RELOAD_SCRIPT}</body></html>",
+                )
+                conn.close()
+
+                events = http.client.HTTPConnection(
+                    "localhost", httpd.server_port, timeout=5
+                )
+                events.request("GET", LIVE_RELOAD_PATH)
+                response = events.getresponse()
+                self.assertEqual(response.status, 200)
+                self.assertEqual(
+                    response.getheader("Content-Type"), "text/event-stream"
+                )
+
+                live_reload.notify(["index.html"])
+                self.assertEqual(response.readline(), b"data: reload\n")
+                events.close()
+            finally:
+                httpd.shutdown()
+                httpd.server_close()
+
+    def test_dev_refuses_source_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "content"))
+
+            with self.assertRaises(ValueError):
+                run_dev(directory=directory)
+
+            self.assertEqual(os.listdir(directory), ["content"])
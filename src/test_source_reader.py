@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import source_reader
+from block_markdown import markdown_to_blocks
+from main import extract_title
+from source_reader import iter_mapped_blocks, mapped_title, open_mapped
+
+
+class TestSourceReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "page.md")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, data):
+        with open(self.path, "wb") as f:
+            f.write(data)
+
+    def read_text(self):
+        with open(self.path, "r") as f:
+            return f.read()
+
+    def test_blocks_match_text_reader(self):
+        sources = [
+            b"# Title\n\nParagraph one\nstill one\n\n\n\n* a\n* b\n",
+            b"# Title\r\n\r\nWindows \xc3\xa9 lines\r\n \t \r\nnext\r\n",
+            b"# Title\rOld mac\r\rline endings\r",
+            b"# Title\n\xc2\xa0\nSplit by a non-breaking space line\n",
+            b"   \n\n# Title\n  indented  \n\n",
+            b"",
+        ]
+
+        for source in sources:
+            self.write(source)
+            with open_mapped(self.path) as buf:
+                blocks = list(iter_mapped_blocks(buf))
+
+            self.assertEqual(blocks, markdown_to_blocks(self.read_text()), source)
+
+    def test_releases_consumed_pages(self):
+        self.write(b"# Title\n\n" + b"para\n\n" * 10000)
+
+        with mock.patch.object(source_reader, "RELEASE_BYTES", 4096):
+            with open_mapped(self.path) as buf:
+                blocks = list(iter_mapped_blocks(buf))
+
+        self.assertEqual(blocks, markdown_to_blocks(self.read_text()))
+
+    def test_title_matches_extract_title(self):
+        sources = [
+            b"intro\n# First\n\n# Last\n",
+            b"# Windows\r\n\r\ntext\r\n",
+            b"text\r# Mac\r",
+            b"#NoSpace\n  # Indented\n# Real \n",
+        ]
+
+        for source in sources:
+            self.write(source)
+            with open_mapped(self.path) as buf:
+                self.assertEqual(
+                    mapped_title(buf), extract_title(self.read_text()), source
+                )
+
+    def test_missing_title(self):
+        for source in (b"No heading\n", b"# \n", b""):
+            self.write(source)
+            with open_mapped(self.path) as buf:
+                with self.assertRaises(ValueError):
+                    mapped_title(buf)
+
+
+if __name__ == "__main__":
+    unittest.main()
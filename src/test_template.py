@@ -0,0 +1,63 @@
+import os
+import unittest
+from io import StringIO
+
+from template import Template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_compile(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+
+        self.assertEqual(template.segments, ["<title>", "</title><main>", "</main>"])
+        self.assertEqual(template.placeholders(), {"Title", "Content"})
+
+    def test_render(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+
+        page = template.render({"Title": "Home", "Content": "<p>Hi</p>"})
+
+        self.assertEqual(page, "<title>Home</title><main><p>Hi</p></main>")
+
+    def test_repeated_placeholder(self):
+        template = Template("{{ Title }} - {{Title}}")
+
+        self.assertEqual(template.render({"Title": "Home"}), "Home - Home")
+
+    def test_extra_placeholders(self):
+        template = Template('<meta content="{{ Description }}">{{ Date }}')
+
+        page = template.render({"Description": "About us", "Date": "2024-01-01"})
+
+        self.assertEqual(page, '<meta content="About us">2024-01-01')
+
+    def test_missing_value_keeps_placeholder(self):
+        template = Template("{{ Title }} {{ Unknown }}")
+
+        self.assertEqual(template.render({"Title": "Home"}), "Home {{ Unknown }}")
+
+    def test_no_placeholders(self):
+        template = Template("<p>static</p>")
+
+        self.assertEqual(template.render({}), "<p>static</p>")
+
+    def test_write(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        out = StringIO()
+
+        template.write(
+            out, {"Title": "Home", "Content": lambda fp: fp.write("<p>Hi</p>")}
+        )
+
+        self.assertEqual(out.getvalue(), "<title>Home</title><main><p>Hi</p></main>")
+
+    def test_matches_replace(self):
+        template_path = os.path.join(os.path.dirname(__file__), "..", "template.html")
+        with open(template_path) as f:
+            source = f.read()
+
+        expected = source.replace("{{ Title }}", "T").replace("{{ Content }}", "C")
+
+        self.assertEqual(
+            Template(source).render({"Title": "T", "Content": "C"}), expected
+        )
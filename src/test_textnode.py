@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from textnode import (
@@ -47,6 +48,11 @@ class TestTextNode(unittest.TestCase):
         expected = f"TextNode({node.text}, {node.text_type}, {node.url})"
         self.assertEqual(node.__repr__(), expected)
 
+    def test_no_instance_dict(self):
+        node = TextNode("This is a text node", TextNode.type_bold)
+
+        self.assertFalse(hasattr(node, "__dict__"))
+
     def test_split_code_delimiter(self):
         node = TextNode("This is text with a `code block` word", TextNode.type_text)
         new_nodes = split_nodes_delimiter([node], "`", "code")
@@ -202,6 +208,57 @@ class TestTextNode(unittest.TestCase):
             ],
         )
 
+    def test_text_to_textnodes_plain_text(self):
+        for text in ["Just words.", "Wow! (really)", "a] b) c", ""]:
+            self.assertEqual(
+                text_to_textnodes(text), [TextNode(text, TextNode.type_text)]
+            )
+
+    def test_text_to_textnodes_matches_multipass(self):
+        fragments = [
+            "plain ",
+            "**",
+            "*",
+            "`",
+            "[",
+            "]",
+            "(",
+            ")",
+            "!",
+            "![img](a.png)",
+            "[link](b.html)",
+            "![",
+            "](",
+            "\n",
+            "word",
+        ]
+        rng = random.Random(1234)
+
+        for _ in range(5000):
+            text = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 12)))
+
+            try:
+                expected = multipass_text_to_textnodes(text)
+            except ValueError as e:
+                with self.assertRaises(ValueError) as ctx:
+                    text_to_textnodes(text)
+                self.assertEqual(str(ctx.exception), str(e), text)
+                continue
+
+            self.assertEqual(text_to_textnodes(text), expected, text)
+
+
+def multipass_text_to_textnodes(text):
+    nodes = [TextNode(text, TextNode.type_text)]
+
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "**", TextNode.type_bold)
+    nodes = split_nodes_delimiter(nodes, "*", TextNode.type_italic)
+    nodes = split_nodes_delimiter(nodes, "`", TextNode.type_code)
+
+    return nodes
+
 
 if __name__ == "__main__":
     unittest.main()
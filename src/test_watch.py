@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from assets import sync_dir
+from main import generate_pages_recursive
+from watch import SiteWatcher, diff_snapshots, snapshot_tree
+
+
+class TestWatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.static = os.path.join(self.tmp.name, "static")
+        self.public = os.path.join(self.tmp.name, "public")
+        self.template = os.path.join(self.tmp.name, "template.html")
+
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\nPosts")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+
+        with redirect_stdout(StringIO()):
+            sync_dir(self.static, self.public)
+            generate_pages_recursive(self.content, self.template, self.public)
+            self.watcher = SiteWatcher(
+                self.content, self.static, self.template, self.public
+            )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+        # Make sure the change is visible even on coarse mtime filesystems.
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def poll(self):
+        with redirect_stdout(StringIO()):
+            return self.watcher.poll()
+
+    def test_diff_snapshots(self):
+        changed, removed = diff_snapshots(
+            {"a": (1, 1), "b": (1, 1), "c": (1, 1)},
+            {"a": (1, 1), "b": (2, 1), "d": (1, 1)},
+        )
+
+        self.assertEqual(changed, ["b", "d"])
+        self.assertEqual(removed, ["c"])
+
+    def test_snapshot_tree(self):
+        self.assertEqual(
+            sorted(snapshot_tree(self.content)),
+            sorted(
+                [
+                    os.path.join(self.content, "index.md"),
+                    os.path.join(self.content, "blog", "index.md"),
+                ]
+            ),
+        )
+
+    def test_no_changes(self):
+        self.assertEqual(self.poll(), [])
+
+    def test_markdown_change_rebuilds_one_page(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nChanged")
+
+        rebuilt = self.poll()
+
+        self.assertEqual(rebuilt, [os.path.join(self.public, "index.html")])
+        self.assertIn("Changed", self.read(os.path.join(self.public, "index.html")))
+
+    def test_new_page(self):
+        self.write(os.path.join(self.content, "about.md"), "# About\n\nUs")
+
+        rebuilt = self.poll()
+
+        self.assertEqual(rebuilt, [os.path.join(self.public, "about.html")])
+
+    def test_removed_page(self):
+        os.remove(os.path.join(self.content, "blog", "index.md"))
+
+        self.poll()
+
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+
+    def test_template_change_rebuilds_all_pages(self):
+        self.write(self.template, "<h2>{{ Title }}</h2>{{ Content }}")
+
+        rebuilt = self.poll()
+
+        self.assertEqual(len(rebuilt), 2)
+        self.assertTrue(
+            self.read(os.path.join(self.public, "index.html")).startswith("<h2>")
+        )
+
+    def test_asset_change_copies_one_file(self):
+        self.write(os.path.join(self.static, "index.css"), "body { margin: 0 }")
+
+        rebuilt = self.poll()
+
+        self.assertEqual(rebuilt, [os.path.join(self.public, "index.css")])
+        self.assertEqual(
+            self.read(os.path.join(self.public, "index.css")), "body { margin: 0 }"
+        )
+
+    def test_saved_manifest_keeps_next_build_incremental(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nChanged")
+        self.poll()
+        self.watcher.save()
+
+        out = StringIO()
+        with redirect_stdout(out):
+            generate_pages_recursive(self.content, self.template, self.public)
+
+        self.assertNotIn("Generating page", out.getvalue())
@@ -10,6 +10,8 @@ class TextNode:
     type_link = "link"
     type_image = "image"
 
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
@@ -26,18 +28,82 @@ class TextNode:
         return f"TextNode({self.text}, {self.text_type}, {self.url})"
 
 
+IMAGE_PATTERN = re.compile(r"!\[(.*?)\]\((.*?)\)")
+LINK_PATTERN = re.compile(r"\[(.*?)\]\((.*?)\)")
+# Every inline construct needs one of these; "!" only matters before "[".
+MARKUP_PATTERN = re.compile(r"[*`\[]")
+
+INLINE_DELIMITERS = [
+    ("**", TextNode.type_bold),
+    ("*", TextNode.type_italic),
+    ("`", TextNode.type_code),
+]
+
+
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextNode.type_text)]
+    # Produces the same nodes as running split_nodes_image, split_nodes_link
+    # and the three split_nodes_delimiter passes in turn, but expands each
+    # piece of text in place instead of rebuilding the node list per pass.
+    if MARKUP_PATTERN.search(text) is None:
+        return [TextNode(text, TextNode.type_text)]
+
+    nodes = []
+    error_levels = []
 
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_delimiter(nodes, "**", TextNode.type_bold)
-    nodes = split_nodes_delimiter(nodes, "*", TextNode.type_italic)
-    nodes = split_nodes_delimiter(nodes, "`", TextNode.type_code)
+    pos = 0
+    for match in IMAGE_PATTERN.finditer(text):
+        tokenize_links(text[pos : match.start()], nodes, error_levels)
+        nodes.append(TextNode(match.group(1), TextNode.type_image, match.group(2)))
+        pos = match.end()
+
+    tokenize_links(text[pos:], nodes, error_levels)
+
+    if len(error_levels) > 0:
+        # The multi-pass splitter reports the earliest pass that fails.
+        delimiter = INLINE_DELIMITERS[min(error_levels)][0]
+        raise ValueError(f"Invalid markdown syntax: missing closing {delimiter}")
 
     return nodes
 
 
+def tokenize_links(text, nodes, error_levels):
+    pos = 0
+    for match in LINK_PATTERN.finditer(text):
+        tokenize_delimiters(text[pos : match.start()], 0, nodes, error_levels)
+        nodes.append(TextNode(match.group(1), TextNode.type_link, match.group(2)))
+        pos = match.end()
+
+    tokenize_delimiters(text[pos:], 0, nodes, error_levels)
+
+
+def tokenize_delimiters(text, level, nodes, error_levels):
+    if len(text) == 0:
+        return
+
+    while level < len(INLINE_DELIMITERS) and INLINE_DELIMITERS[level][0] not in text:
+        level += 1
+
+    if level == len(INLINE_DELIMITERS):
+        nodes.append(TextNode(text, TextNode.type_text))
+        return
+
+    delimiter, text_type = INLINE_DELIMITERS[level]
+    parts = text.split(delimiter)
+
+    if len(parts) % 2 == 0:
+        error_levels.append(level)
+        return
+
+    for i in range(len(parts)):
+        if len(parts[i]) == 0:
+            continue
+
+        if i % 2 == 1:
+            nodes.append(TextNode(parts[i], text_type))
+        else:
+            tokenize_delimiters(parts[i], level + 1, nodes, error_levels)
+
+
 def text_node_to_html_node(text_node):
     if text_node.text_type == TextNode.type_text:
         return LeafNode(None, text_node.text)
@@ -151,12 +217,8 @@ def split_nodes_link(old_nodes):
 
 
 def extract_markdown_images(text):
-    regex = r"!\[(.*?)\]\((.*?)\)"
-    matches = re.findall(regex, text)
-    return matches
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text):
-    regex = r"\[(.*?)\]\((.*?)\)"
-    matches = re.findall(regex, text)
-    return matches
+    return LINK_PATTERN.findall(text)
@@ -0,0 +1,192 @@
+import os
+import time
+
+from assets import load_synced_files, place_file, remove_empty_dirs, save_synced_files
+from compress import compress_file, remove_variants
+from fragment_cache import FragmentCache
+from main import find_pages, remove_output, render_page
+from manifest import Manifest, hash_file, manifest_path
+from template import load_template
+
+
+def snapshot_tree(root):
+    files = {}
+    if not os.path.isdir(root):
+        return files
+
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                files.update(snapshot_tree(entry.path))
+            else:
+                stat = entry.stat()
+                files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+    return files
+
+
+def diff_snapshots(old, new):
+    changed = [path for path in new if old.get(path) != new[path]]
+    removed = [path for path in old if path not in new]
+    return sorted(changed), sorted(removed)
+
+
+class SiteWatcher:
+    def __init__(
+        self,
+        content_dir,
+        static_dir,
+        template_path,
+        dest_dir,
+        cache_dir=None,
+        precompress=False,
+    ):
+        self.content_dir = content_dir
+        self.static_dir = static_dir
+        self.template_path = template_path
+        self.dest_dir = dest_dir
+        self.cache = FragmentCache(cache_dir) if cache_dir is not None else None
+        self.precompress = precompress
+
+        self.template = load_template(template_path)
+        self.template_hash = hash_file(template_path)
+        self.template_stat = self.stat_template()
+
+        self.manifest = Manifest(manifest_path(dest_dir))
+        self.manifest.load()
+        self.pages = dict(find_pages(content_dir, dest_dir))
+        self.assets = set(load_synced_files(dest_dir))
+
+        self.content_snapshot = snapshot_tree(content_dir)
+        self.static_snapshot = snapshot_tree(static_dir)
+
+    def stat_template(self):
+        stat = os.stat(self.template_path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def output_path(self, from_path):
+        rel_path = os.path.relpath(from_path, self.content_dir)
+        return os.path.join(self.dest_dir, rel_path)[:-3] + ".html"
+
+    def render(self, from_path):
+        dest_path = self.pages[from_path]
+        if os.path.relpath(dest_path, self.dest_dir) in self.assets:
+            print(
+                f"Failed to generate page from '{from_path}': "
+                f"'{dest_path}' is also a static file"
+            )
+            return False
+
+        try:
+            render_page(
+                from_path,
+                self.template,
+                dest_path,
+                self.cache,
+                dest_dir_path=self.dest_dir,
+            )
+        except Exception as e:
+            print(f"Failed to generate page from '{from_path}': {e}")
+            return False
+
+        self.manifest.record(
+            from_path, hash_file(from_path), self.template_hash, dest_path
+        )
+        print(f"Regenerated {dest_path}")
+        return True
+
+    def poll(self):
+        rebuilt = []
+
+        template_stat = self.stat_template()
+        template_changed = template_stat != self.template_stat
+        if template_changed:
+            self.template_stat = template_stat
+            self.template = load_template(self.template_path)
+            self.template_hash = hash_file(self.template_path)
+
+        content_snapshot = snapshot_tree(self.content_dir)
+        changed, removed = diff_snapshots(self.content_snapshot, content_snapshot)
+        self.content_snapshot = content_snapshot
+
+        for from_path in removed:
+            dest_path = self.pages.pop(from_path, None)
+            if dest_path is not None:
+                remove_output(dest_path, self.dest_dir)
+                rebuilt.append(dest_path)
+
+        if len(removed) > 0:
+            self.manifest.prune(set(self.pages))
+
+        for from_path in changed:
+            if from_path.endswith(".md"):
+                self.pages[from_path] = self.output_path(from_path)
+
+        # A template change touches every page; otherwise only the
+        # markdown files that changed are rendered again.
+        if template_changed:
+            targets = sorted(self.pages)
+        else:
+            targets = [path for path in changed if path in self.pages]
+
+        for from_path in targets:
+            if self.render(from_path):
+                rebuilt.append(self.pages[from_path])
+
+        static_snapshot = snapshot_tree(self.static_dir)
+        changed, removed = diff_snapshots(self.static_snapshot, static_snapshot)
+        self.static_snapshot = static_snapshot
+
+        for src_path in changed:
+            rel_path = os.path.relpath(src_path, self.static_dir)
+            dest_path = os.path.join(self.dest_dir, rel_path)
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            place_file(src_path, dest_path)
+            self.assets.add(rel_path)
+            rebuilt.append(dest_path)
+            print(f"Synced {dest_path}")
+
+        for src_path in removed:
+            rel_path = os.path.relpath(src_path, self.static_dir)
+            dest_path = os.path.join(self.dest_dir, rel_path)
+            self.assets.discard(rel_path)
+            if os.path.lexists(dest_path):
+                os.remove(dest_path)
+                print(f"Removed {dest_path}")
+            remove_variants(dest_path)
+            remove_empty_dirs(os.path.dirname(dest_path), self.dest_dir)
+            rebuilt.append(dest_path)
+
+        if self.precompress:
+            static = set(os.path.join(self.dest_dir, path) for path in self.assets)
+            for path in rebuilt:
+                if os.path.isfile(path):
+                    compress_file(path, keep=static)
+
+        return rebuilt
+
+    def save(self):
+        self.manifest.save()
+        save_synced_files(self.dest_dir, self.assets)
+
+    def run(self, interval=0.25, on_rebuild=None):
+        print(
+            f"Watching '{self.content_dir}', '{self.static_dir}' and "
+            f"'{self.template_path}' for changes (Ctrl-C to stop)"
+        )
+        try:
+            while True:
+                start = time.perf_counter()
+                rebuilt = self.poll()
+                if len(rebuilt) > 0:
+                    elapsed = (time.perf_counter() - start) * 1000
+                    print(f"Rebuilt {len(rebuilt)} file(s) in {elapsed:.1f} ms")
+                    self.save()
+                    if on_rebuild is not None:
+                        on_rebuild(rebuilt)
+
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.save()